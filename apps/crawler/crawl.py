@@ -4,6 +4,12 @@
 运行（无需参数）：
   uv run apps/crawler/crawl.py
 
+部署：
+  - 代码与依赖均不依赖特定 CPU 架构，可直接运行在 linux/arm64 主机上（如 AWS Graviton），
+    通常比同价位 x86 更快、更便宜
+  - 需确保 Python 链接的 OpenSSL 启用了 ARMv8 Crypto 扩展，R2 上传签名的 SHA-256 才能走硬件加速
+    （启动时 [R2] 日志会打印当前 SHA-256 后端）
+
 配置说明：
   - 爬虫配置：CRAWLER_CONFIGS 数组，每个配置包含 type、url、author、color
   - LLM 提供商：LLM_PROVIDERS 字典，支持 deepseek、openrouter 等
@@ -20,19 +26,30 @@
     可选值: DeepInfra, Together, Fireworks, Lepton, Novita, Lambda 等
     格式: "Provider1,Provider2" 或 "Provider1:order=1,Provider2:order=2"
   - HONO_BASE_URL: Hono 服务基础地址
+  - CRAWL_CONCURRENCY: 同时运行的爬虫批次数量（默认 2）
+  - CRAWL_BATCH_SIZE: 合并为一次 LLM 抽取的同类配置数量上限（默认 4）
+  - ARTICLE_CACHE_PATH: 已有文章摘要缓存文件（默认 ~/.cache/mikunews/articles.json）
+  - LOG_LEVEL: 日志级别（默认 INFO；DEBUG 时输出异常堆栈）
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import json
+import logging
 import os
+import re
 import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, List, Tuple
+from typing import List, Optional, Tuple
 from urllib.parse import quote
-from urllib.request import urlopen
+
+import aiohttp
+import orjson
+from playwright.async_api import Browser, async_playwright
 
 # Ensure repo root on sys.path when running as a script
 CURRENT_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -43,16 +60,20 @@ if REPO_ROOT not in sys.path:
 from apps.crawler.push_to_hono import (  # noqa: E402
     ArticlePayload,
     build_article_from_weibo,
-    post_article,
     load_config_from_env,
+    post_articles_bulk,
 )
+from apps.crawler.r2_uploader import R2Config  # noqa: E402
 from apps.crawler.weibo import (  # noqa: E402
     LLMSettings,
-    crawl_weibo,
+    crawl_weibo_batch,
 )
+from apps.crawler.weibo_image_downloader import CHROMIUM_ARGS  # noqa: E402
+
+logger = logging.getLogger("crawler")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LLMProviderConfig:
     """LLM 提供商配置"""
 
@@ -61,11 +82,13 @@ class LLMProviderConfig:
     api_token_env: str  # API token 环境变量名
     base_url: str  # API 基础 URL
     temperature: float = 0.3  # 温度参数
-    max_tokens: int = 2000  # 最大 token 数
+    max_tokens: int = 1500  # 单次 LLM 输出的最大 token 数
+    timeout_s: int = 60  # 单次 LLM 请求超时（秒）
+    max_retries: int = 2  # LLM 请求失败时的最大重试次数
     extra_headers: dict[str, str] | None = None  # 额外的 HTTP 头
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CrawlerConfig:
     """爬虫配置"""
 
@@ -83,7 +106,9 @@ LLM_PROVIDERS = {
         api_token_env="DEEPSEEK_APIKEY",
         base_url="https://api.deepseek.com/v1",
         temperature=0.3,
-        max_tokens=2000,
+        max_tokens=1500,
+        timeout_s=60,
+        max_retries=2,
     ),
     "openrouter": LLMProviderConfig(
         name="openrouter",
@@ -91,7 +116,9 @@ LLM_PROVIDERS = {
         api_token_env="OPENROUTER_API_KEY",
         base_url="https://openrouter.ai/api/v1",
         temperature=0.3,
-        max_tokens=2000,
+        max_tokens=1500,
+        timeout_s=60,
+        max_retries=2,
         extra_headers={
             # 通过 X-Provider-Preference 指定供应商优先级
             # 格式: "Provider1,Provider2" 或 "Provider1:order=1,Provider2:order=2"
@@ -127,80 +154,193 @@ HEADLESS = True
 DOWNLOAD_MEDIA = True
 PUSH_TO_HONO = True
 DRY_RUN = False
+# 同时运行的爬虫批次数量（所有批次共享一个浏览器，各自新建 context）
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "2"))
+# 同类型的多个主页合并为一次 LLM 抽取，单批最多包含的配置数
+CRAWL_BATCH_SIZE = int(os.getenv("CRAWL_BATCH_SIZE", "4"))
 
 # Hono 基础地址：优先使用环境变量 HONO_BASE_URL，否则回退到本地开发地址
 HONO_BASE_URL = os.getenv("HONO_BASE_URL", "http://127.0.0.1:8787")
 HONO_SUBMIT_URL = f"{HONO_BASE_URL.rstrip('/')}/submit"
 
+# frontmatter 结束分隔符的最大查找范围（字符数），超出则视为无 frontmatter
+FRONTMATTER_SCAN_LIMIT = 4096
+
+# 已有文章 (title, timestamp) 的本地缓存：按文件名记录索引中的 sha，sha 不变则不再拉取详情
+ARTICLE_CACHE_PATH = os.getenv(
+    "ARTICLE_CACHE_PATH", os.path.expanduser("~/.cache/mikunews/articles.json")
+)
+# 缓存最多保留的文章数（按 timestamp 保留最新的）
+ARTICLE_CACHE_MAX_ENTRIES = 500
+
+
+# 标题比较时移除的标点/符号与空白
+_TITLE_NOISE_RE = re.compile(r"[\W_]+")
+
+
+# frontmatter 中的 title / timestamp 行（键名不区分大小写），一次正则扫描取出
+_FRONTMATTER_FIELD_RE = re.compile(
+    r"^[ \t]*(title|timestamp)[ \t]*:[ \t]*(.*?)[ \t\r]*$", re.IGNORECASE | re.MULTILINE
+)
+
 
 def _today_prefix() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
 
-def _fetch_existing_article_summaries(hono_base_url: str) -> List[Tuple[str, str]]:
+def _normalize_title(title: str) -> str:
+    """归一化标题用于去重比较：忽略大小写、标点与多余空白。"""
+    return _TITLE_NOISE_RE.sub(" ", title.lower()).strip()
+
+
+def _parse_frontmatter(frontmatter: str) -> Tuple[str | None, int]:
+    """从 frontmatter 文本中解析 (title, timestamp)，缺失时分别为 None / 0。"""
+    title_value: str | None = None
+    ts_value = 0
+    for match in _FRONTMATTER_FIELD_RE.finditer(frontmatter):
+        value = match.group(2).strip('"').strip("'")
+        if not value:
+            continue
+        if match.group(1).lower() == "title":
+            title_value = value
+        else:
+            try:
+                ts_value = int(value)
+            except ValueError:
+                ts_value = 0
+    return title_value, ts_value
+
+
+async def _fetch_article_detail(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    base: str,
+    name: str,
+) -> dict | None:
+    """读取单篇文章详情 JSON，失败时返回 None。"""
+    # 文件名可能包含非 ASCII 字符，需 URL 编码
+    detail_url = f"{base}/articles/{quote(name, safe='')}"
+    try:
+        async with sem, session.get(detail_url) as resp:
+            resp.raise_for_status()
+            return orjson.loads(await resp.read())
+    except Exception as e:  # noqa: BLE001
+        logger.warning("[Crawler] WARNING: Failed to fetch article %s: %s", name, e)
+        return None
+
+
+def _summarize_article(detail: dict) -> Tuple[str | None, int]:
+    """从文章详情 JSON 中取出 (title, timestamp)。"""
+    content = (detail.get("file") or {}).get("content") or ""
+
+    # 轻量解析 frontmatter：在第一对 --- 之间解析 title / timestamp
+    # 结束分隔符只在文件开头的前 4 KB 内查找，不扫描/切分整篇正文
+    if content.startswith("---"):
+        end = content.find("\n---", 3, FRONTMATTER_SCAN_LIMIT)
+        if end != -1:
+            return _parse_frontmatter(content[3:end])
+    return None, 0
+
+
+def _load_article_cache() -> dict[str, dict]:
+    """读取本地文章摘要缓存 {name: {"sha", "title", "ts"}}，不存在或损坏时返回空字典。
+
+    非字典或缺少 sha 的条目（文件截断、手工修改等）会被丢弃，对应文章下次重新拉取。
+    """
+    try:
+        with open(ARTICLE_CACHE_PATH, "rb") as f:
+            cache = orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:  # noqa: BLE001
+        logger.warning("[Crawler] WARNING: Ignoring unreadable article cache: %s", e)
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    return {
+        name: entry
+        for name, entry in cache.items()
+        if isinstance(entry, dict) and isinstance(entry.get("sha"), str)
+    }
+
+
+def _save_article_cache(cache: dict[str, dict]) -> None:
+    """原子写入本地文章摘要缓存（先写临时文件再 rename），只保留最新的若干条。"""
+    if len(cache) > ARTICLE_CACHE_MAX_ENTRIES:
+        newest = sorted(cache.items(), key=lambda kv: kv[1].get("ts") or 0, reverse=True)
+        cache = dict(newest[:ARTICLE_CACHE_MAX_ENTRIES])
+    tmp_path = f"{ARTICLE_CACHE_PATH}.tmp"
+    try:
+        os.makedirs(os.path.dirname(ARTICLE_CACHE_PATH), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(cache))
+        os.replace(tmp_path, ARTICLE_CACHE_PATH)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("[Crawler] WARNING: Failed to write article cache: %s", e)
+
+
+async def _fetch_existing_article_summaries(hono_base_url: str) -> List[Tuple[str, str]]:
     """
     从 Hono /articles 读取已有文章，解析 frontmatter 中的 title 和 timestamp，
     生成最近的 20 条 (日期, 标题) 列表，用于传递给 LLM 做“已有文章参考”。
+
+    解析结果按文件名缓存在本地（ARTICLE_CACHE_PATH），并记录索引中的 sha；
+    只有新文章或 sha 变化的文章才会重新拉取详情（同一个 aiohttp 会话，最多 16 个并发请求）。
     """
     base = hono_base_url.rstrip("/")
     index_url = f"{base}/articles"
 
-    try:
-        with urlopen(index_url, timeout=30) as resp:
-            raw = resp.read().decode("utf-8", errors="ignore")
-        data = json.loads(raw)
-    except Exception as e:  # noqa: BLE001
-        print(f"[Crawler] WARNING: Failed to fetch /articles index: {e}")
-        return []
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        try:
+            async with session.get(index_url) as resp:
+                resp.raise_for_status()
+                data = orjson.loads(await resp.read())
+        except Exception as e:  # noqa: BLE001
+            logger.warning("[Crawler] WARNING: Failed to fetch /articles index: %s", e)
+            return []
+
+        files = [f for f in data.get("files") or [] if f.get("name")]
+        cache = _load_article_cache()
+        to_fetch = [
+            f
+            for f in files
+            if not f.get("sha") or cache.get(f["name"], {}).get("sha") != f["sha"]
+        ]
+        logger.info(
+            "[Crawler] Article index: %s files, %s cached, %s to fetch",
+            len(files),
+            len(files) - len(to_fetch),
+            len(to_fetch),
+        )
 
-    files = data.get("files") or []
-    summaries_with_ts: List[Tuple[str, str, int]] = []
+        sem = asyncio.Semaphore(16)
+        details = await asyncio.gather(
+            *(_fetch_article_detail(session, sem, base, f["name"]) for f in to_fetch)
+        )
 
-    for f in files:
-        name = f.get("name")
-        if not name:
+    for f, detail in zip(to_fetch, details):
+        if detail is None:
+            # 拉取失败：丢弃旧缓存，下次运行重新拉取
+            cache.pop(f["name"], None)
             continue
+        title_value, ts_value = _summarize_article(detail)
+        cache[f["name"]] = {"sha": f.get("sha"), "title": title_value, "ts": ts_value}
 
-        # 文件名可能包含非 ASCII 字符，需 URL 编码
-        detail_url = f"{base}/articles/{quote(name, safe='')}"
-        try:
-            with urlopen(detail_url, timeout=30) as resp:
-                raw = resp.read().decode("utf-8", errors="ignore")
-            detail = json.loads(raw)
-        except Exception as e:  # noqa: BLE001
-            print(f"[Crawler] WARNING: Failed to fetch article {name}: {e}")
-            continue
+    # 只保留索引中仍存在的文章
+    cache = {f["name"]: cache[f["name"]] for f in files if f["name"] in cache}
+    if to_fetch:
+        # 文件写入放到线程中，避免阻塞事件循环
+        await asyncio.to_thread(_save_article_cache, cache)
 
-        content = (detail.get("file") or {}).get("content") or ""
-
-        # 轻量解析 frontmatter：在第一对 --- 之间解析 title / timestamp
-        title_value: str | None = None
-        ts_value: int | None = None
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                frontmatter = parts[1]
-                for line in frontmatter.splitlines():
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    key, sep, value = line.partition(":")
-                    if sep != ":":
-                        continue
-                    key = key.strip().lower()
-                    value = value.strip().strip('"').strip("'")
-                    if not value:
-                        continue
-                    if key == "title":
-                        title_value = value
-                    elif key == "timestamp":
-                        try:
-                            ts_value = int(value)
-                        except ValueError:
-                            ts_value = None
+    summaries_with_ts: List[Tuple[str, str, int]] = []
 
+    for entry in cache.values():
+        title_value = entry.get("title")
         if not title_value:
             continue
+        ts_value = entry.get("ts") or 0
 
         # 将毫秒级时间戳转为 YYYY-MM-DD，失败则标记为“日期未知”
         date_str = "日期未知"
@@ -211,26 +351,29 @@ def _fetch_existing_article_summaries(hono_base_url: str) -> List[Tuple[str, str
             except Exception:
                 pass
 
-        summaries_with_ts.append((date_str, title_value, ts_value or 0))
+        summaries_with_ts.append((date_str, title_value, ts_value))
 
     if summaries_with_ts:
-        print(f"[Crawler] Existing articles from /articles: {len(summaries_with_ts)}")
+        logger.info("[Crawler] Existing articles from /articles: %s", len(summaries_with_ts))
 
     # 取最近的 20 条（按 timestamp 从新到旧）；无 timestamp 视为最旧
     summaries_with_ts.sort(key=lambda x: x[2], reverse=True)
     limited = summaries_with_ts[:20]
     if len(limited) < len(summaries_with_ts):
-        print(f"[Crawler] Using latest {len(limited)} articles for LLM context")
+        logger.info("[Crawler] Using latest %s articles for LLM context", len(limited))
 
     return [(date, title) for date, title, _ in limited]
 
 
+@functools.lru_cache(maxsize=4)
 def _build_weibo_prompt(
-    existing_articles: Iterable[Tuple[str, str]] | None = None,
+    existing_articles: Tuple[Tuple[str, str], ...] = (),
 ) -> str:
     """
     构造给 crawl4ai 的提示词。
     在原有规则基础上，追加“已有文章时间+标题”信息，由 LLM 自行判断是否为重复内容。
+
+    参数需为元组以便缓存：所有配置共用同一份已有文章列表，提示词只拼接一次。
     """
     base_prompt = """
 你是一个内容筛选与整理助手，目标页面是一名微博用户的主页。
@@ -245,13 +388,12 @@ def _build_weibo_prompt(
 - 有真实微博内容时，只输出微博 JSON 对象，不要输出额外解释；如果完全没有内容，返回空数组 []
 """.strip()
 
-    articles_list = list(existing_articles or [])
-    if not articles_list:
+    if not existing_articles:
         return base_prompt
 
     # 为避免提示词过长，只取前 N 条已有文章，用于提示“已有内容”
     max_items = 100
-    sliced = articles_list[:max_items]
+    sliced = existing_articles[:max_items]
     joined = "\n".join(f"- {date} {title}" for date, title in sliced)
 
     dedup_note = f"""
@@ -267,26 +409,48 @@ def _build_weibo_prompt(
     return f"{base_prompt}\n{dedup_note}"
 
 
-async def run_crawler_for_config(
-    config: CrawlerConfig, existing_articles: List[Tuple[str, str]]
-) -> Tuple[int, int, int]:
+def _batch_configs(configs: List[CrawlerConfig]) -> List[List[CrawlerConfig]]:
+    """按 type 分组（LLM 提供商由 LLM_PROVIDER 全局指定，所有批次相同），
+    每组再切分为最多 CRAWL_BATCH_SIZE 个配置的批次。"""
+    groups: dict[str, List[CrawlerConfig]] = {}
+    for config in configs:
+        groups.setdefault(config.type, []).append(config)
+
+    size = max(1, CRAWL_BATCH_SIZE)
+    return [
+        group[i : i + size] for group in groups.values() for i in range(0, len(group), size)
+    ]
+
+
+async def run_crawler_for_batch(
+    configs: List[CrawlerConfig],
+    existing_articles: List[Tuple[str, str]],
+    browser: Optional[Browser] = None,
+) -> List[Tuple[int, int, int]]:
     """
-    为单个配置运行爬虫。
+    为一批同类型的配置运行爬虫：共用一次 LLM 抽取，再分别构建并推送文章。
+    browser 为 main() 中启动的共享浏览器，媒体下载阶段复用它而不是重新启动。
 
-    返回: (crawled_count, built_count, pushed_count)
+    返回: 与 configs 一一对应的 (crawled_count, built_count, pushed_count) 列表
     """
-    print(f"\n[Crawler] ========== Starting Crawler ==========")
-    print(f"[Crawler] Type: {config.type}")
-    print(f"[Crawler] URL: {config.url}")
-    print(f"[Crawler] Author: {config.author}")
-    print(f"[Crawler] Headless: {HEADLESS}, Download Media: {DOWNLOAD_MEDIA}")
-    print(f"[Crawler] Push to Hono: {PUSH_TO_HONO}, Dry Run: {DRY_RUN}")
+    # 多个批次并发运行时，用作者名区分各自的日志
+    tag = f"[Crawler:{', '.join(c.author for c in configs)}]"
+    empty = [(0, 0, 0) for _ in configs]
+    crawler_type = configs[0].type
+    # 本次运行统一使用同一个日期前缀（R2 key 目录）
+    date_prefix = _today_prefix()
+    logger.info("\n%s ========== Starting Crawler ==========", tag)
+    logger.info("%s Type: %s", tag, crawler_type)
+    for config in configs:
+        logger.info("%s URL: %s (author: %s)", tag, config.url, config.author)
+    logger.info("%s Headless: %s, Download Media: %s", tag, HEADLESS, DOWNLOAD_MEDIA)
+    logger.info("%s Push to Hono: %s, Dry Run: %s", tag, PUSH_TO_HONO, DRY_RUN)
 
     # 获取 LLM 配置
     llm_provider_name = DEFAULT_LLM_PROVIDER
     if llm_provider_name not in LLM_PROVIDERS:
-        print(
-            f"[Crawler] ✗ Unknown LLM provider: {llm_provider_name}, falling back to 'deepseek'"
+        logger.warning(
+            "%s ✗ Unknown LLM provider: %s, falling back to 'deepseek'", tag, llm_provider_name
         )
         llm_provider_name = "deepseek"
 
@@ -297,171 +461,252 @@ async def run_crawler_for_config(
         base_url=llm_provider.base_url,
         temperature=llm_provider.temperature,
         max_tokens=llm_provider.max_tokens,
+        timeout_s=llm_provider.timeout_s,
+        max_retries=llm_provider.max_retries,
         extra_headers=llm_provider.extra_headers,
     )
-    print(
-        f"[Crawler] LLM: {llm_provider.name} ({llm_settings.provider}) @ {llm_settings.base_url}"
+    logger.info(
+        "%s LLM: %s (%s) @ %s (max_tokens=%s, timeout=%ss, max_retries=%s)",
+        tag,
+        llm_provider.name,
+        llm_settings.provider,
+        llm_settings.base_url,
+        llm_settings.max_tokens,
+        llm_settings.timeout_s,
+        llm_settings.max_retries,
     )
     if llm_provider.extra_headers:
-        print(f"[Crawler] Extra headers: {llm_provider.extra_headers}")
+        logger.info("%s Extra headers: %s", tag, llm_provider.extra_headers)
 
     r2_config = load_config_from_env()
     if r2_config:
-        print(
-            f"[Crawler] R2: {r2_config.endpoint}/{r2_config.bucket} (prefix: {r2_config.prefix})"
+        logger.info(
+            "%s R2: %s/%s (prefix: %s)", tag, r2_config.endpoint, r2_config.bucket, r2_config.prefix
         )
     else:
-        print("[Crawler] R2: Not configured")
+        logger.info("%s R2: Not configured", tag)
         if DOWNLOAD_MEDIA:
-            print("[Crawler] WARNING: Media download enabled but R2 not configured!")
+            logger.warning("%s WARNING: Media download enabled but R2 not configured!", tag)
 
     # Step 1: 根据类型调用相应的爬虫
-    posts = []
     try:
-        print(f"\n[Crawler] Step 1: Crawling posts...")
+        logger.info("\n%s Step 1: Crawling posts...", tag)
 
-        if config.type == "weibo":
-            posts = await crawl_weibo(
-                url=config.url,
-                instruction=_build_weibo_prompt(existing_articles),
+        if crawler_type == "weibo":
+            posts_per_config = await crawl_weibo_batch(
+                sources=[(config.url, config.author) for config in configs],
+                instruction=_build_weibo_prompt(tuple(existing_articles)),
                 headless=HEADLESS,
                 download_media=DOWNLOAD_MEDIA,
                 llm_settings=llm_settings,
                 r2_config=r2_config,
-                date_prefix=_today_prefix(),
+                date_prefix=date_prefix,
+                browser=browser,
             )
         else:
-            print(f"[Crawler] ✗ Unknown crawler type: {config.type}")
-            return (0, 0, 0)
-
-        print(f"[Crawler] ✓ Crawled {len(posts)} posts (raw from LLM)")
+            logger.error("%s ✗ Unknown crawler type: %s", tag, crawler_type)
+            return empty
     except Exception as e:
-        print(f"[Crawler] ✗ Crawling failed: {e}")
-        import traceback
+        logger.error("%s ✗ Crawling failed: %r", tag, e)
+        logger.debug("%s Crawling traceback", tag, exc_info=True)
+        return empty
 
-        traceback.print_exc()
-        return (0, 0, 0)
+    # 已有文章标题集合：LLM 去重提示未生效时，在构建（下载/上传媒体）前再过滤一次
+    existing_titles = frozenset(
+        normalized for _, title in existing_articles if (normalized := _normalize_title(title))
+    )
+
+    results = await asyncio.gather(
+        *(
+            run_crawler_for_config(config, posts, r2_config, date_prefix, existing_titles)
+            for config, posts in zip(configs, posts_per_config)
+        )
+    )
+    return list(results)
+
+
+async def run_crawler_for_config(
+    config: CrawlerConfig,
+    posts: List[dict],
+    r2_config: Optional[R2Config],
+    date_prefix: str,
+    existing_titles: frozenset[str] = frozenset(),
+) -> Tuple[int, int, int]:
+    """
+    为单个配置构建并推送已爬取的帖子。
+    标题与 existing_titles（已归一化）相同的帖子视为已存在，直接跳过。
+
+    返回: (crawled_count, built_count, pushed_count)
+    """
+    tag = f"[Crawler:{config.author}]"
+    logger.info("%s ✓ Crawled %s posts (raw from LLM)", tag, len(posts))
 
     if not posts:
-        print("[Crawler] No posts found")
+        logger.info("%s No posts found", tag)
         return (0, 0, 0)
 
     # If not pushing, just print and exit
     if not PUSH_TO_HONO and not DRY_RUN:
-        print("\n[Crawler] Raw posts output:")
+        logger.info("\n%s Raw posts output:", tag)
         print(json.dumps(posts, ensure_ascii=False, indent=2))
         return (len(posts), 0, 0)
 
     # Step 2: Build articles from posts
-    print(f"\n[Crawler] Step 2: Building articles...")
+    logger.info("\n%s Step 2: Building articles...", tag)
     articles: list[ArticlePayload] = []
     failed_builds = 0
+    skipped_builds = 0
 
     for i, post in enumerate(posts, 1):
         post_title = post.get("title") or post.get("url") or f"post_{i}"
+        if existing_titles and _normalize_title(post.get("title") or "") in existing_titles:
+            skipped_builds += 1
+            logger.info(
+                "%s [%s/%s] Skipping existing article: %s", tag, i, len(posts), post_title
+            )
+            continue
         try:
-            print(f"[Crawler] [{i}/{len(posts)}] Building article: {post_title}")
+            logger.info("%s [%s/%s] Building article: %s", tag, i, len(posts), post_title)
 
-            # 根据类型调用相应的构建函数
+            # 根据类型调用相应的构建函数（媒体下载/上传是阻塞 IO，放到线程中执行，
+            # 避免阻塞其他并发运行的配置）
             if config.type == "weibo":
-                article = build_article_from_weibo(
+                article = await asyncio.to_thread(
+                    build_article_from_weibo,
                     post,
                     default_color=config.color,
                     author=config.author,
-                    date_prefix=_today_prefix(),
+                    date_prefix=date_prefix,
                     r2_config=r2_config,
                 )
             else:
-                print(f"[Crawler]   ✗ Unknown type for building: {config.type}")
+                logger.error("%s   ✗ Unknown type for building: %s", tag, config.type)
                 failed_builds += 1
                 continue
 
             articles.append(article)
             media_count = len(article.gallery) if article.gallery else 0
-            print(f"[Crawler]   ✓ Built article with {media_count} media items")
+            logger.info("%s   ✓ Built article with %s media items", tag, media_count)
         except Exception as e:
             failed_builds += 1
-            print(f"[Crawler]   ✗ Failed to build article: {e}")
-            import traceback
-
-            traceback.print_exc()
-
-    print(f"[Crawler] ✓ Built {len(articles)} articles ({failed_builds} failed)")
+            logger.error("%s   ✗ Failed to build article: %r", tag, e)
+            logger.debug("%s   Build traceback", tag, exc_info=True)
+
+    logger.info(
+        "%s ✓ Built %s articles (%s failed, %s skipped as existing)",
+        tag,
+        len(articles),
+        failed_builds,
+        skipped_builds,
+    )
 
     if not articles:
-        print("[Crawler] No articles to push")
+        logger.info("%s No articles to push", tag)
         return (len(posts), 0, 0)
 
     # If dry run, print articles and exit
     if DRY_RUN:
-        print("\n[Crawler] Dry run - articles output:")
+        logger.info("\n%s Dry run - articles output:", tag)
         print(json.dumps([a.to_dict() for a in articles], ensure_ascii=False, indent=2))
         return (len(posts), len(articles), 0)
 
     # Step 3: Push articles to Hono
-    print(f"\n[Crawler] Step 3: Pushing articles to {HONO_SUBMIT_URL}...")
+    logger.info("\n%s Step 3: Pushing articles to %s...", tag, HONO_SUBMIT_URL)
     pushed = 0
     failed_pushes = 0
 
-    for i, article in enumerate(articles, 1):
-        try:
-            print(f"[Crawler] [{i}/{len(articles)}] Pushing: {article.title}")
-            post_article(HONO_SUBMIT_URL, article)
+    push_errors = await post_articles_bulk(HONO_SUBMIT_URL, articles)
+    for i, (article, error) in enumerate(zip(articles, push_errors), 1):
+        if error is None:
             pushed += 1
-            print(f"[Crawler]   ✓ Pushed successfully")
-        except Exception as e:
+            logger.info("%s [%s/%s] ✓ Pushed: %s", tag, i, len(articles), article.title)
+        else:
             failed_pushes += 1
-            print(f"[Crawler]   ✗ Push failed: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.error(
+                "%s [%s/%s] ✗ Push failed: %s: %r", tag, i, len(articles), article.title, error
+            )
+            logger.debug("%s   Push traceback", tag, exc_info=error)
 
-    print(f"\n[Crawler] ========== Summary for {config.author} ==========")
-    print(f"[Crawler] Posts crawled: {len(posts)}")
-    print(f"[Crawler] Articles built: {len(articles)} ({failed_builds} failed)")
-    print(f"[Crawler] Articles pushed: {pushed} ({failed_pushes} failed)")
-    print(f"[Crawler] ================================")
+    logger.info("\n%s ========== Summary for %s ==========", tag, config.author)
+    logger.info("%s Posts crawled: %s", tag, len(posts))
+    logger.info("%s Articles built: %s (%s failed)", tag, len(articles), failed_builds)
+    logger.info("%s Articles skipped (existing): %s", tag, skipped_builds)
+    logger.info("%s Articles pushed: %s (%s failed)", tag, pushed, failed_pushes)
+    logger.info("%s ================================", tag)
 
     return (len(posts), len(articles), pushed)
 
 
 async def main() -> None:
     """主函数：遍历所有爬虫配置并执行"""
-    print(f"[Crawler] ========== MikuNews Crawler ==========")
-    print(f"[Crawler] Total crawler configs: {len(CRAWLER_CONFIGS)}")
-    print(f"[Crawler] Hono base URL: {HONO_BASE_URL}")
+    logger.info("[Crawler] ========== MikuNews Crawler ==========")
+    logger.info("[Crawler] Total crawler configs: %s", len(CRAWLER_CONFIGS))
+    logger.info("[Crawler] Hono base URL: %s", HONO_BASE_URL)
 
     # Step 0: 从 Hono 获取已有文章的"时间 + 标题"信息，传给 LLM 做去重参考
-    print(
-        f"\n[Crawler] Step 0: Fetching existing articles from {HONO_BASE_URL.rstrip('/')}/articles ..."
+    logger.info(
+        "\n[Crawler] Step 0: Fetching existing articles from %s/articles ...",
+        HONO_BASE_URL.rstrip("/"),
     )
-    existing_articles = _fetch_existing_article_summaries(HONO_BASE_URL)
+    # 作为后台任务启动，与浏览器启动并行；各批次在需要时 await（完成后再 await 不再有开销）
+    existing_task = asyncio.create_task(_fetch_existing_article_summaries(HONO_BASE_URL))
+
+    # 同类配置合并为批次（共用一次 LLM 抽取），批次之间并发运行，
+    # 同时运行的浏览器数量受 CRAWL_CONCURRENCY 限制
+    batches = _batch_configs(CRAWLER_CONFIGS)
+    logger.info("[Crawler] Crawl batches: %s, concurrency: %s", len(batches), CRAWL_CONCURRENCY)
+    sem = asyncio.Semaphore(CRAWL_CONCURRENCY)
+
+    async def _run_with_limit(
+        idx: int, batch: List[CrawlerConfig], browser: Optional[Browser]
+    ) -> List[Tuple[int, int, int]]:
+        async with sem:
+            tag = f"[Crawler:{', '.join(c.author for c in batch)}]"
+            logger.info("\n%s ========================================", tag)
+            logger.info(
+                "%s Processing batch %s/%s (%s configs)", tag, idx, len(batches), len(batch)
+            )
+            logger.info("%s ========================================", tag)
+            existing_articles = await existing_task
+            return await run_crawler_for_batch(batch, existing_articles, browser)
+
+    # 媒体下载阶段的浏览器只启动一次，所有批次共享（各自新建 context）；
+    # 不下载媒体时不启动 Playwright
+    async with contextlib.AsyncExitStack() as stack:
+        browser: Optional[Browser] = None
+        if DOWNLOAD_MEDIA:
+            playwright = await stack.enter_async_context(async_playwright())
+            browser = await playwright.chromium.launch(headless=HEADLESS, args=CHROMIUM_ARGS)
+            stack.push_async_callback(browser.close)
+        try:
+            batch_results = await asyncio.gather(
+                *(_run_with_limit(idx, batch, browser) for idx, batch in enumerate(batches, 1))
+            )
+        finally:
+            if not existing_task.done():
+                existing_task.cancel()
+    results = [result for batch_result in batch_results for result in batch_result]
 
     # 统计信息
-    total_crawled = 0
-    total_built = 0
-    total_pushed = 0
-
-    # 遍历所有配置
-    for idx, config in enumerate(CRAWLER_CONFIGS, 1):
-        print(f"\n[Crawler] ========================================")
-        print(f"[Crawler] Processing config {idx}/{len(CRAWLER_CONFIGS)}")
-        print(f"[Crawler] ========================================")
-
-        crawled, built, pushed = await run_crawler_for_config(config, existing_articles)
-        total_crawled += crawled
-        total_built += built
-        total_pushed += pushed
+    total_crawled = sum(crawled for crawled, _, _ in results)
+    total_built = sum(built for _, built, _ in results)
+    total_pushed = sum(pushed for _, _, pushed in results)
 
     # 总结
-    print(f"\n[Crawler] ========== Final Summary ==========")
-    print(f"[Crawler] Configs processed: {len(CRAWLER_CONFIGS)}")
-    print(f"[Crawler] Total posts crawled: {total_crawled}")
-    print(f"[Crawler] Total articles built: {total_built}")
-    print(f"[Crawler] Total articles pushed: {total_pushed}")
-    print(f"[Crawler] =====================================")
-    print(f"[Crawler] Done!")
+    logger.info("\n[Crawler] ========== Final Summary ==========")
+    logger.info("[Crawler] Configs processed: %s", len(CRAWLER_CONFIGS))
+    logger.info("[Crawler] Total posts crawled: %s", total_crawled)
+    logger.info("[Crawler] Total articles built: %s", total_built)
+    logger.info("[Crawler] Total articles pushed: %s", total_pushed)
+    logger.info("[Crawler] =====================================")
+    logger.info("[Crawler] Done!")
 
 
 if __name__ == "__main__":
+    # 只输出消息本身，保持与原 print 输出一致；LOG_LEVEL=DEBUG 时才打印异常堆栈
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+        stream=sys.stdout,
+    )
     asyncio.run(main())
@@ -16,11 +16,16 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
+import re
+import shutil
 import sys
 import tempfile
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -28,13 +33,20 @@ from typing import Any, Dict, List, Literal, Optional
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
-from apps.crawler.r2_uploader import R2Uploader, load_config_from_env, R2Config
+import aiohttp
+import orjson
+
+from apps.crawler.r2_uploader import R2Uploader, get_uploader, load_config_from_env, R2Config
 
 
 MediaType = Literal["image", "video"]
+MediaSource = Literal["remote", "local", "other"]
+
+# 单篇文章内并发处理（下载 + 上传）媒体的最大线程数
+MEDIA_WORKERS = 8
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaItem:
     type: MediaType
     src: str
@@ -42,7 +54,7 @@ class MediaItem:
     poster: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ArticlePayload:
     title: str
     importance: int
@@ -71,15 +83,16 @@ class ArticlePayload:
         if self.author:
             data["author"] = self.author
         if self.gallery:
-            data["gallery"] = [
-                {
-                    "type": item.type,
-                    "src": item.src,
-                    **({"alt": item.alt} if item.alt else {}),
-                    **({"poster": item.poster} if item.poster else {}),
-                }
-                for item in self.gallery
-            ]
+            # 直接按需赋值可选字段，避免每个媒体项额外构造临时 dict 再展开
+            gallery: List[Dict[str, Any]] = []
+            for item in self.gallery:
+                media: Dict[str, Any] = {"type": item.type, "src": item.src}
+                if item.alt:
+                    media["alt"] = item.alt
+                if item.poster:
+                    media["poster"] = item.poster
+                gallery.append(media)
+            data["gallery"] = gallery
         return data
 
 
@@ -126,18 +139,47 @@ def load_weibo_posts(path: Optional[str]) -> List[Dict[str, Any]]:
     return data
 
 
+# normalize_timestamp 的兜底“当前时间”缓存：(monotonic 时刻, 毫秒时间戳)
+_NOW_MS_TTL = 60.0
+_now_ms_cache: tuple[float, int] = (float("-inf"), 0)
+
+
+def _now_ms() -> int:
+    """返回当前 UTC 毫秒时间戳，60 秒内复用同一个值。"""
+    global _now_ms_cache
+    checked_at, value = _now_ms_cache
+    mono = time.monotonic()
+    if mono - checked_at > _NOW_MS_TTL:
+        value = int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+        _now_ms_cache = (mono, value)
+    return value
+
+
+# 匹配 YYYY-MM-DD / YYYY/MM/DD，可选 HH:MM；日期分隔符需前后一致
+_TIMESTAMP_RE = re.compile(
+    r"^(\d{4})([-/])(\d{1,2})\2(\d{1,2})(?:[ T](\d{1,2}):(\d{1,2}))?$"
+)
+
+
 def normalize_timestamp(date_str: str) -> int:
     """将 weibo.py 输出的 date 字段转换为毫秒级时间戳，失败则返回当前时间。"""
-    date_str = (date_str or "").strip()
-    formats = ["%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y/%m/%d %H:%M", "%Y/%m/%d"]
-    for fmt in formats:
+    m = _TIMESTAMP_RE.match((date_str or "").strip())
+    if m:
+        year, _, month, day, hour, minute = m.groups()
         try:
-            dt = datetime.strptime(date_str, fmt)
-            return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000)
+            dt = datetime(
+                int(year),
+                int(month),
+                int(day),
+                int(hour or 0),
+                int(minute or 0),
+                tzinfo=timezone.utc,
+            )
+            return int(dt.timestamp() * 1000)
         except ValueError:
-            continue
+            pass
     # 兼容"日期未知"或无法解析的情况
-    return int(datetime.now(tz=timezone.utc).timestamp() * 1000)
+    return _now_ms()
 
 
 def guess_media_type(url: str) -> MediaType:
@@ -151,42 +193,72 @@ def guess_media_type(url: str) -> MediaType:
 
 def _is_r2_url(url: str, config: R2Config) -> bool:
     """Best-effort check whether a URL already points to this R2 bucket."""
-    try:
-        parsed = urlparse(url)
-    except Exception:
-        return False
-
-    # public_base_url 优先，其次是 endpoint/bucket 组合
-    if config.public_base_url:
-        base = config.public_base_url.rstrip("/")
-        if url.startswith(base + "/"):
-            return True
-
-    endpoint = config.endpoint.rstrip("/")
-    bucket_prefix = f"{endpoint}/{config.bucket}/"
-    if url.startswith(bucket_prefix):
-        return True
-
-    return False
+    # public_base_url 或 endpoint/bucket 前缀，均已在 R2Config 中预先计算
+    return url.startswith(config.url_prefixes)
 
 
 def _download_to_temp(url: str) -> Optional[str]:
     """Download remote media to a temporary file and return local path."""
+    tmp_path: Optional[str] = None
     try:
         print(f"[Push] Downloading remote media for R2: {url}")
-        with urlopen(url, timeout=30) as resp:
-            data = resp.read()
         suffix = os.path.splitext(urlparse(url).path)[1] or ""
-        fd, tmp_path = tempfile.mkstemp(prefix="mikunews-media-", suffix=suffix)
-        with os.fdopen(fd, "wb") as f:
-            f.write(data)
+        with urlopen(url, timeout=30) as resp:
+            fd, tmp_path = tempfile.mkstemp(prefix="mikunews-media-", suffix=suffix)
+            # 按 1 MB 分块写入，避免整个视频文件驻留内存
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(resp, f, length=1024 * 1024)
         print(f"[Push] Downloaded to temp file: {tmp_path}")
         return tmp_path
     except Exception as e:  # noqa: BLE001
         print(f"[Push] Failed to download remote media {url}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         return None
 
 
+def _classify_media(src_str: str) -> MediaSource:
+    """先按 scheme 分类媒体来源，只有非 URL 的输入才需要访问文件系统。"""
+    scheme = urlparse(src_str).scheme
+    if scheme in {"http", "https"}:
+        return "remote"
+    if not scheme and os.path.isfile(src_str):
+        return "local"
+    return "other"
+
+
+def _process_one_media(
+    src_str: str,
+    source: MediaSource,
+    uploader: Optional[R2Uploader],
+    r2_config: Optional[R2Config],
+) -> MediaItem:
+    """处理单个媒体：按需下载并上传到 R2，返回最终的 MediaItem。"""
+    if uploader and r2_config:
+        upload_path: Optional[str] = None
+
+        if source == "remote":
+            if not _is_r2_url(src_str, r2_config):
+                # 远程 HTTP 媒体且尚未在当前 R2 上：先下载再上传
+                upload_path = _download_to_temp(src_str)
+        elif source == "local":
+            # 本地文件：直接上传
+            upload_path = src_str
+
+        if upload_path:
+            print(f"[Push] Uploading media to R2: {src_str} -> {upload_path}")
+            try:
+                uploaded = uploader.upload_file(upload_path)
+                src_str = uploaded
+                print(f"[Push] Uploaded -> {src_str}")
+            except Exception as e:  # noqa: BLE001
+                print(f"[Push] Upload failed for {src_str}: {e}")
+                # Keep original src_str as fallback
+
+    media_type: MediaType = guess_media_type(src_str)
+    return MediaItem(type=media_type, src=src_str)
+
+
 def build_article_from_weibo(
     post: Dict[str, Any],
     default_color: str,
@@ -207,48 +279,30 @@ def build_article_from_weibo(
         importance = 2
 
     media_urls = post.get("media_urls") or []
-    gallery: List[MediaItem] = []
+    sources = [(src, _classify_media(src)) for src in (str(media) for media in media_urls if media)]
 
     # 如果存在本地文件但没有配置 R2，则直接报错提醒
-    has_local_files = any(os.path.isfile(str(media)) for media in media_urls if media)
+    has_local_files = any(source == "local" for _, source in sources)
     if has_local_files and not r2_config:
         raise RuntimeError("R2 未配置，但存在本地文件需要上传")
 
-    uploader = R2Uploader(r2_config, date_prefix=date_prefix) if r2_config else None
+    uploader = get_uploader(r2_config, date_prefix) if r2_config else None
     if uploader and r2_config:
         print(f"[Push] R2 uploader enabled. prefix={r2_config.prefix} date_prefix={date_prefix}")
 
-    for media in media_urls:
-        if not media:
-            continue
-        src_str = str(media)
-
-        if uploader and r2_config:
-            upload_path: Optional[str] = None
-
-            if os.path.isfile(src_str):
-                # 本地文件：直接上传
-                upload_path = src_str
-            else:
-                parsed = urlparse(src_str)
-                is_http = parsed.scheme in {"http", "https"}
-                if is_http and not _is_r2_url(src_str, r2_config):
-                    # 远程 HTTP 媒体且尚未在当前 R2 上：先下载再上传
-                    tmp = _download_to_temp(src_str)
-                    upload_path = tmp
-
-            if upload_path:
-                print(f"[Push] Uploading media to R2: {src_str} -> {upload_path}")
-                try:
-                    uploaded = uploader.upload_file(upload_path)
-                    src_str = uploaded
-                    print(f"[Push] Uploaded -> {src_str}")
-                except Exception as e:  # noqa: BLE001
-                    print(f"[Push] Upload failed for {src_str}: {e}")
-                    # Keep original src_str as fallback
-
-        media_type: MediaType = guess_media_type(src_str)
-        gallery.append(MediaItem(type=media_type, src=src_str))
+    if uploader and len(sources) > 1:
+        # 多个媒体的下载+上传互不依赖，用线程池并发处理；map 保证结果顺序与输入一致
+        workers = min(MEDIA_WORKERS, len(sources))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            gallery = list(
+                executor.map(
+                    lambda item: _process_one_media(item[0], item[1], uploader, r2_config), sources
+                )
+            )
+    else:
+        gallery = [
+            _process_one_media(src, source, uploader, r2_config) for src, source in sources
+        ]
 
     body_lines = [content_md] if content_md else []
     if url:
@@ -277,7 +331,7 @@ def build_article_from_weibo(
 def post_article(api_url: str, payload: ArticlePayload) -> None:
     article_dict = payload.to_dict()
     print(f"[Push] Gallery sources: {[item['src'] for item in article_dict.get('gallery', [])]}")
-    data = json.dumps(article_dict).encode("utf-8")
+    data = orjson.dumps(article_dict)
     print(f"[Push] POST {api_url} title={payload.title} id={payload.id}")
     req = Request(
         api_url,
@@ -293,6 +347,49 @@ def post_article(api_url: str, payload: ArticlePayload) -> None:
         print(f"[OK] 推送成功：{payload.title}")
 
 
+async def _post_article_async(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    api_url: str,
+    payload: ArticlePayload,
+) -> None:
+    article_dict = payload.to_dict()
+    async with sem:
+        print(f"[Push] Gallery sources: {[item['src'] for item in article_dict.get('gallery', [])]}")
+        print(f"[Push] POST {api_url} title={payload.title} id={payload.id}")
+        async with session.post(api_url, data=orjson.dumps(article_dict)) as resp:
+            body = await resp.text(errors="ignore")
+            print(f"[Push] Response {resp.status}: {body}")
+            if resp.status >= 300:
+                raise RuntimeError(f"Push failed ({resp.status}): {body}")
+            print(f"[OK] 推送成功：{payload.title}")
+
+
+async def post_articles_bulk(
+    api_url: str,
+    articles: List[ArticlePayload],
+    concurrency: int = 8,
+) -> List[Optional[BaseException]]:
+    """
+    复用同一个 keep-alive 连接池并发推送多篇文章。
+
+    返回与 articles 一一对应的列表：推送成功为 None，失败为对应的异常。
+    """
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    sem = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession(
+        headers={"Content-Type": "application/json"},
+        timeout=timeout,
+        connector=connector,
+    ) as session:
+        results = await asyncio.gather(
+            *(_post_article_async(session, sem, api_url, a) for a in articles),
+            return_exceptions=True,
+        )
+    return [r if isinstance(r, BaseException) else None for r in results]
+
+
 def main() -> None:
     args = parse_args()
     r2_config = load_config_from_env()
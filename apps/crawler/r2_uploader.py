@@ -1,5 +1,6 @@
 """
-Minimal S3-compatible uploader for Cloudflare R2 using only stdlib.
+Minimal S3-compatible uploader for Cloudflare R2 (SigV4 signing in stdlib,
+HTTP over a shared urllib3 connection pool).
 
 Environment variables (required):
   R2_ENDPOINT             e.g. https://<accountid>.r2.cloudflarestorage.com
@@ -10,22 +11,74 @@ Environment variables (required):
 Optional:
   R2_PREFIX               key prefix, e.g. miku/images
   R2_PUBLIC_BASE_URL      public base URL for constructed links (e.g. https://cdn.example.com)
+  R2_UNSIGNED_PAYLOAD     set to 1 to sign uploads with UNSIGNED-PAYLOAD (skips hashing
+                          the file; integrity then relies on TLS)
 """
 
 from __future__ import annotations
 
-import datetime
+import asyncio
+import functools
 import hashlib
 import hmac
+import logging
 import mimetypes
 import os
-from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Optional
-from urllib.parse import urlparse, quote
-from urllib.request import Request, urlopen
-
-
-@dataclass
+from urllib.parse import urlparse
+
+import urllib3
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Max PUTs in flight across all uploaders
+UPLOAD_MAX_CONCURRENCY = 16
+
+# Shared across all uploaders/threads so consecutive PUTs to the same endpoint
+# reuse the TCP+TLS connection instead of handshaking per upload.
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=UPLOAD_MAX_CONCURRENCY, block=False)
+# Dedicated threads for the async upload variants, sized to the connection pool. The
+# loop's default executor scales with CPU count (6 threads on a 2-core runner) and is
+# shared with hashing and other to_thread work, which would cap concurrent uploads.
+_UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=UPLOAD_MAX_CONCURRENCY, thread_name_prefix="r2-upload")
+# Transient server errors worth retrying; connection/read errors are retried too.
+RETRY_STATUSES = (500, 502, 503, 504)
+# Content types for the media the crawler uploads
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".mp4": "video/mp4",
+}
+# x-amz-content-sha256 value that tells R2 the body itself is not signed
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+# Headers covered by the upload signature, lowercased and sorted as SigV4 requires
+SIGNED_HEADERS = "content-type;host;x-amz-content-sha256;x-amz-date"
+# Files above this size are sent with chunk-signed streaming (aws-chunked) instead
+# of being hashed in a separate pass before the upload
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+STREAMING_CHUNK_SIZE = 64 * 1024
+STREAMING_PAYLOAD = "STREAMING-AWS4-HMAC-SHA256-PAYLOAD"
+STREAMING_SIGNED_HEADERS = (
+    "content-encoding;content-type;host;x-amz-content-sha256;x-amz-date;"
+    "x-amz-decoded-content-length"
+)
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+# Byte -> URI path encoding: RFC 3986 unreserved characters and '/' stay as-is,
+# everything else becomes %XX (same result as quote(segment, safe="") per segment).
+_URI_UNRESERVED = frozenset(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.~/"
+)
+_URI_PATH_QUOTE = tuple(chr(b) if b in _URI_UNRESERVED else f"%{b:02X}" for b in range(256))
+
+
+@dataclass(frozen=True, slots=True)
 class R2Config:
     endpoint: str
     bucket: str
@@ -33,18 +86,58 @@ class R2Config:
     secret_key: str
     prefix: str = ""
     public_base_url: Optional[str] = None
+    unsigned_payload: bool = False
+    # URL prefixes of objects already stored in this bucket, for str.startswith checks
+    url_prefixes: tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        prefixes = []
+        if self.public_base_url:
+            prefixes.append(self.public_base_url.rstrip("/") + "/")
+        prefixes.append(f"{self.endpoint.rstrip('/')}/{self.bucket}/")
+        # Derived once at construction; frozen dataclasses need object.__setattr__
+        object.__setattr__(self, "url_prefixes", tuple(prefixes))
 
 
 class R2Uploader:
     def __init__(self, config: R2Config, date_prefix: Optional[str] = None, debug: bool = False):
+        _check_hash_backend()
         self.config = config
         self.date_prefix = date_prefix
         self.debug = debug
-        parsed = urlparse(config.endpoint)
-        if not parsed.scheme or not parsed.netloc:
-            raise ValueError("R2_ENDPOINT must be a valid URL")
-        self.host = parsed.netloc
-        self.scheme = parsed.scheme
+        self.scheme, self.host = _parse_endpoint(config.endpoint)
+        # Every upload is a PUT signing the same headers; only the URI, content type,
+        # payload hash and date vary, so prebuild the canonical request around them.
+        self._canonical_put_template = "\n".join(
+            [
+                "PUT",
+                "{uri}",
+                "",  # query string
+                "content-type:{content_type}",
+                "host:" + self.host,
+                "x-amz-content-sha256:{payload_hash}",
+                "x-amz-date:{amz_date}",
+                "",  # end of canonical headers
+                SIGNED_HEADERS,
+                "{payload_hash}",
+            ]
+        )
+        self._canonical_streaming_template = "\n".join(
+            [
+                "PUT",
+                "{uri}",
+                "",  # query string
+                "content-encoding:aws-chunked",
+                "content-type:{content_type}",
+                "host:" + self.host,
+                "x-amz-content-sha256:" + STREAMING_PAYLOAD,
+                "x-amz-date:{amz_date}",
+                "x-amz-decoded-content-length:{decoded_length}",
+                "",  # end of canonical headers
+                STREAMING_SIGNED_HEADERS,
+                STREAMING_PAYLOAD,
+            ]
+        )
 
     def _derive_key(self, filename: str) -> str:
         segments = []
@@ -55,149 +148,331 @@ class R2Uploader:
         segments.append(filename)
         return "/".join(segments)
 
-    def _encode_uri_path(self, path: str) -> str:
-        """Encode URI path for AWS Signature V4.
-
-        Each path segment should be URL-encoded, but '/' should not be encoded.
+    def _sign(
+        self,
+        uri: str,
+        content_type: str,
+        payload_hash: str,
+        amz_date: str,
+        date_stamp: str,
+        decoded_length: Optional[int] = None,
+    ) -> tuple[str, str]:
+        """Return (Authorization header, signature).
+
+        With decoded_length set the request is signed for aws-chunked streaming, and
+        the signature is the seed for the per-chunk signatures.
         """
-        # Split by '/', encode each segment, then rejoin
-        segments = path.split('/')
-        encoded_segments = [quote(segment, safe='') for segment in segments]
-        return '/'.join(encoded_segments)
-
-    def _sign(self, method: str, uri: str, headers: dict, payload_hash: str, amz_date: str, date_stamp: str) -> str:
         # Encode URI for canonical request
-        canonical_uri = self._encode_uri_path(uri)
-
-        canonical_headers = "".join(
-            f"{k.lower()}:{headers[k].strip()}\n" for k in sorted(headers)
-        )
-        signed_headers = ";".join(sorted(k.lower() for k in headers))
-        canonical_request = "\n".join(
-            [
-                method,
-                canonical_uri,
-                "",  # query string
-                canonical_headers,
-                signed_headers,
-                payload_hash,
-            ]
-        )
+        canonical_uri = _encode_uri_path(uri)
+        if decoded_length is None:
+            signed_headers = SIGNED_HEADERS
+            canonical_request = self._canonical_put_template.format(
+                uri=canonical_uri,
+                content_type=content_type.strip(),
+                payload_hash=payload_hash,
+                amz_date=amz_date,
+            )
+        else:
+            signed_headers = STREAMING_SIGNED_HEADERS
+            canonical_request = self._canonical_streaming_template.format(
+                uri=canonical_uri,
+                content_type=content_type.strip(),
+                amz_date=amz_date,
+                decoded_length=decoded_length,
+            )
 
         algorithm = "AWS4-HMAC-SHA256"
-        credential_scope = f"{date_stamp}/auto/s3/aws4_request"
-        string_to_sign = "\n".join(
-            [
-                algorithm,
-                amz_date,
-                credential_scope,
-                hashlib.sha256(canonical_request.encode()).hexdigest(),
-            ]
-        )
+        credential_scope = _credential_scope(date_stamp)
+        canonical_request_hash = hashlib.sha256(canonical_request.encode()).hexdigest()
+        string_to_sign = "\n".join([algorithm, amz_date, credential_scope, canonical_request_hash])
 
         signing_key = _get_signature_key(self.config.secret_key, date_stamp, "auto", "s3")
-        signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        signature = hmac.digest(signing_key, string_to_sign.encode(), "sha256").hex()
 
         authorization_header = (
             f"{algorithm} Credential={self.config.access_key}/{credential_scope}, "
             f"SignedHeaders={signed_headers}, Signature={signature}"
         )
 
-        if self.debug:
-            print("\n[R2 Debug] Signature Details:")
-            print(f"  Method: {method}")
-            print(f"  URI (raw): {uri}")
-            print(f"  URI (canonical): {canonical_uri}")
-            print(f"  Signed Headers: {signed_headers}")
-            print(f"  Payload Hash: {payload_hash}")
-            print(f"  Date: {amz_date}")
-            print(f"  Canonical Request Hash: {hashlib.sha256(canonical_request.encode()).hexdigest()}")
-            print(f"  Signature: {signature}")
-            print(f"  Authorization: {authorization_header[:80]}...")
-
-        return authorization_header
-
-    def upload_file(self, file_path: str, object_name: Optional[str] = None, max_retries: int = 3) -> str:
+        if self.debug and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[R2 Debug] Signature Details:\n"
+                "  Method: PUT\n"
+                "  URI (raw): %s\n"
+                "  URI (canonical): %s\n"
+                "  Signed Headers: %s\n"
+                "  Payload Hash: %s\n"
+                "  Date: %s\n"
+                "  Canonical Request Hash: %s\n"
+                "  Signature: %s\n"
+                "  Authorization: %s...",
+                uri,
+                canonical_uri,
+                signed_headers,
+                payload_hash,
+                amz_date,
+                canonical_request_hash,
+                signature,
+                authorization_header[:80],
+            )
+
+        return authorization_header, signature
+
+    def upload_file(
+        self,
+        file_path: str,
+        object_name: Optional[str] = None,
+        max_retries: int = 3,
+        payload_hash: Optional[str] = None,
+    ) -> str:
+        """Upload a local file and return its public URL.
+
+        payload_hash may carry a hex SHA-256 the caller already computed for the
+        file, so it is not hashed a second time for signing.
+        """
         if not os.path.isfile(file_path):
             raise FileNotFoundError(file_path)
 
-        print(f"[R2] Preparing upload: {file_path}")
-        with open(file_path, "rb") as f:
-            data = f.read()
+        logger.debug("[R2] Preparing upload: %s", file_path)
+        file_size = os.path.getsize(file_path)
 
         filename = object_name or os.path.basename(file_path)
         key = self._derive_key(filename)
         uri = f"/{self.config.bucket}/{key}"
         url = f"{self.scheme}://{self.host}{uri}"
 
-        file_size_kb = len(data) / 1024
-        print(f"[R2] Uploading {file_size_kb:.1f} KB to: {url}")
-
-        last_error = None
-        for attempt in range(1, max_retries + 1):
-            try:
-                payload_hash = hashlib.sha256(data).hexdigest()
-                now = datetime.datetime.utcnow()
-                amz_date = now.strftime("%Y%m%dT%H%M%SZ")
-                date_stamp = now.strftime("%Y%m%d")
-
-                content_type, _ = mimetypes.guess_type(filename)
-                content_type = content_type or "application/octet-stream"
-
-                headers = {
-                    "Host": self.host,
-                    "x-amz-content-sha256": payload_hash,
-                    "x-amz-date": amz_date,
-                    "Content-Type": content_type,
-                }
-
-                auth = self._sign("PUT", uri, headers, payload_hash, amz_date, date_stamp)
-                headers["Authorization"] = auth
-
-                if attempt > 1:
-                    print(f"[R2] Retry attempt {attempt}/{max_retries}")
-
-                req = Request(url, data=data, method="PUT", headers=headers)
-                with urlopen(req, timeout=60) as resp:
-                    if resp.status not in (200, 201):
-                        body = resp.read().decode('utf-8', errors='ignore')
-                        raise RuntimeError(f"Upload failed: {resp.status} {body}")
-
-                print(f"[R2] ✓ Upload success: {key}")
-
-                if self.config.public_base_url:
-                    base = self.config.public_base_url.rstrip("/")
-                    public_url = f"{base}/{key}"
-                    print(f"[R2] Public URL: {public_url}")
-                    return public_url
-
-                fallback_url = f"{self.config.endpoint.rstrip('/')}/{self.config.bucket}/{key}"
-                print(f"[R2] Public URL (fallback): {fallback_url}")
-                return fallback_url
-
-            except Exception as e:
-                last_error = e
-                error_msg = str(e)
-                print(f"[R2] ✗ Upload attempt {attempt} failed: {error_msg}")
-
-                # Print detailed error info for debugging
-                if "401" in error_msg or "Unauthorized" in error_msg:
-                    print(f"[R2] Authentication failed. Please check:")
-                    print(f"[R2]   - R2_ACCESS_KEY_ID is correct")
-                    print(f"[R2]   - R2_SECRET_ACCESS_KEY is correct")
-                    print(f"[R2]   - Bucket '{self.config.bucket}' exists and is accessible")
-                    print(f"[R2]   - Endpoint: {self.config.endpoint}")
-                elif "SSL" in error_msg or "EOF" in error_msg:
-                    print(f"[R2] Network/SSL error. This might be transient, retrying...")
-
-                if attempt < max_retries:
-                    import time
-                    wait_time = attempt * 2  # Exponential backoff: 2s, 4s, 6s
-                    print(f"[R2] Waiting {wait_time}s before retry...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"[R2] All {max_retries} attempts failed")
-                    raise RuntimeError(f"Failed to upload after {max_retries} attempts: {last_error}") from last_error
+        file_size_kb = file_size / 1024
+        logger.debug("[R2] Uploading %.1f KB to: %s", file_size_kb, url)
+
+        # Large files are signed chunk by chunk while streaming, so they are read once
+        streaming = (
+            not self.config.unsigned_payload
+            and payload_hash is None
+            and file_size > STREAMING_THRESHOLD
+        )
+        if self.config.unsigned_payload:
+            payload_hash = UNSIGNED_PAYLOAD
+        elif streaming:
+            payload_hash = STREAMING_PAYLOAD
+        else:
+            payload_hash = payload_hash or sha256_file(file_path)
+        amz_date = "%04d%02d%02dT%02d%02d%02dZ" % time.gmtime()[:6]
+        date_stamp = amz_date[:8]
+
+        content_type = _content_type(filename)
+
+        auth, signature = self._sign(
+            uri,
+            content_type,
+            payload_hash,
+            amz_date,
+            date_stamp,
+            decoded_length=file_size if streaming else None,
+        )
+        # Built once in final form; urllib3 resends this same dict on retries,
+        # so nothing is rebuilt per attempt.
+        headers = {
+            "Content-Type": content_type,
+            "Host": self.host,
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+            "Authorization": auth,
+            # The body is streamed from disk; an explicit length keeps urllib3 from
+            # falling back to chunked transfer encoding.
+            "Content-Length": str(file_size),
+        }
+        if streaming:
+            headers["Content-Encoding"] = "aws-chunked"
+            headers["x-amz-decoded-content-length"] = str(file_size)
+            headers["Content-Length"] = str(_aws_chunked_length(file_size))
+
+        # urllib3 rewinds the body to its start position before each retry
+        if streaming:
+            body = _AwsChunkedBody(
+                file_path,
+                _get_signature_key(self.config.secret_key, date_stamp, "auto", "s3"),
+                amz_date,
+                _credential_scope(date_stamp),
+                signature,
+            )
+        else:
+            body = open(file_path, "rb")
+        with body:
+            return self._put(url, key, body, headers, max_retries)
+
+    def upload_bytes(self, data: bytes | bytearray, object_name: str, max_retries: int = 3) -> str:
+        """Upload in-memory content under object_name and return its public URL.
+
+        Lets callers that already hold the bytes (e.g. a fresh download) skip
+        writing them out and reading them back for the upload.
+        """
+        key = self._derive_key(object_name)
+        uri = f"/{self.config.bucket}/{key}"
+        url = f"{self.scheme}://{self.host}{uri}"
+        logger.debug("[R2] Uploading %.1f KB to: %s", len(data) / 1024, url)
+
+        if self.config.unsigned_payload:
+            payload_hash = UNSIGNED_PAYLOAD
+        else:
+            payload_hash = hashlib.sha256(data).hexdigest()
+        amz_date = "%04d%02d%02dT%02d%02d%02dZ" % time.gmtime()[:6]
+        date_stamp = amz_date[:8]
+
+        content_type = _content_type(object_name)
+        auth, _ = self._sign(uri, content_type, payload_hash, amz_date, date_stamp)
+        headers = {
+            "Content-Type": content_type,
+            "Host": self.host,
+            "x-amz-content-sha256": payload_hash,
+            "x-amz-date": amz_date,
+            "Authorization": auth,
+            "Content-Length": str(len(data)),
+        }
+        return self._put(url, key, data, headers, max_retries)
+
+    def _put(self, url: str, key: str, body, headers: dict[str, str], max_retries: int) -> str:
+        """Send a signed PUT and return the object's public URL."""
+        try:
+            resp = _HTTP.request(
+                "PUT",
+                url,
+                body=body,
+                headers=headers,
+                timeout=60.0,
+                retries=_retry_policy(max_retries),
+            )
+        except Exception as e:
+            error_msg = str(e)
+            logger.error("[R2] ✗ Upload failed: %s", error_msg)
+            if "SSL" in error_msg or "EOF" in error_msg:
+                logger.warning("[R2] Network/SSL error persisted after %s attempts", max_retries)
+            raise RuntimeError(f"Failed to upload after {max_retries} attempts: {e}") from e
+
+        if resp.status not in (200, 201):
+            body = resp.data.decode("utf-8", errors="ignore")
+            logger.error("[R2] ✗ Upload failed: %s %s", resp.status, body)
+            if resp.status in (401, 403):
+                logger.warning(
+                    "[R2] Authentication failed. Please check:\n"
+                    "[R2]   - R2_ACCESS_KEY_ID is correct\n"
+                    "[R2]   - R2_SECRET_ACCESS_KEY is correct\n"
+                    "[R2]   - Bucket '%s' exists and is accessible\n"
+                    "[R2]   - Endpoint: %s",
+                    self.config.bucket,
+                    self.config.endpoint,
+                )
+            raise RuntimeError(f"Upload failed: {resp.status} {body}")
+
+        logger.info("[R2] ✓ Upload success: %s", key)
+
+        if self.config.public_base_url:
+            base = self.config.public_base_url.rstrip("/")
+            public_url = f"{base}/{key}"
+            logger.debug("[R2] Public URL: %s", public_url)
+            return public_url
+
+        fallback_url = f"{self.config.endpoint.rstrip('/')}/{self.config.bucket}/{key}"
+        logger.debug("[R2] Public URL (fallback): %s", fallback_url)
+        return fallback_url
+
+    async def upload_file_async(
+        self,
+        file_path: str,
+        object_name: Optional[str] = None,
+        max_retries: int = 3,
+        payload_hash: Optional[str] = None,
+    ) -> str:
+        """Async variant of upload_file for use inside the crawler's event loop.
+
+        The PUT itself runs on the dedicated upload threads over the shared connection
+        pool, so several uploads can be in flight at once without blocking the loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            _UPLOAD_EXECUTOR, self.upload_file, file_path, object_name, max_retries, payload_hash
+        )
+
+    async def upload_bytes_async(self, data: bytes | bytearray, object_name: str, max_retries: int = 3) -> str:
+        """Async variant of upload_bytes; the PUT runs on the dedicated upload threads."""
+        return await asyncio.get_running_loop().run_in_executor(
+            _UPLOAD_EXECUTOR, self.upload_bytes, data, object_name, max_retries
+        )
+
+
+class _AwsChunkedBody:
+    """File-like aws-chunked request body that signs each chunk as it is read.
+
+    Every chunk is framed as ``<hex size>;chunk-signature=<sig>\\r\\n<data>\\r\\n``,
+    where each signature chains from the previous one (starting at the request's
+    seed signature), and a final empty chunk terminates the body. Only seek(0) is
+    supported, which is all urllib3 needs to rewind for a retry.
+    """
+
+    def __init__(self, file_path: str, signing_key: bytes, amz_date: str, scope: str, seed_signature: str):
+        self._file = open(file_path, "rb")
+        self._signing_key = signing_key
+        self._string_to_sign_prefix = f"AWS4-HMAC-SHA256-PAYLOAD\n{amz_date}\n{scope}\n"
+        self._seed_signature = seed_signature
+        self._prev_signature = seed_signature
+        self._buffer = bytearray()
+        self._pos = 0
+        self._done = False
+
+    def _next_frame(self) -> bytes:
+        chunk = self._file.read(STREAMING_CHUNK_SIZE)
+        if not chunk:
+            self._done = True
+        string_to_sign = (
+            f"{self._string_to_sign_prefix}{self._prev_signature}\n"
+            f"{_EMPTY_SHA256}\n{hashlib.sha256(chunk).hexdigest()}"
+        )
+        self._prev_signature = hmac.digest(self._signing_key, string_to_sign.encode(), "sha256").hex()
+        return b"%x;chunk-signature=%s\r\n%s\r\n" % (len(chunk), self._prev_signature.encode(), chunk)
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            self._buffer += self._next_frame()
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        self._pos += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if offset != 0 or whence != 0:
+            raise OSError("aws-chunked body can only be rewound to the start")
+        self._file.seek(0)
+        self._prev_signature = self._seed_signature
+        self._buffer.clear()
+        self._pos = 0
+        self._done = False
+        return 0
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "_AwsChunkedBody":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _aws_chunked_length(decoded_length: int) -> int:
+    """Content-Length of the aws-chunked encoding of a decoded_length-byte body."""
+    # <hex size>;chunk-signature=<64 hex>\r\n<data>\r\n
+    frame_overhead = len(";chunk-signature=") + 64 + 4
+    full_chunks, remainder = divmod(decoded_length, STREAMING_CHUNK_SIZE)
+    length = full_chunks * (len(f"{STREAMING_CHUNK_SIZE:x}") + frame_overhead + STREAMING_CHUNK_SIZE)
+    if remainder:
+        length += len(f"{remainder:x}") + frame_overhead + remainder
+    # Final zero-length chunk
+    return length + 1 + frame_overhead
 
 
 def load_config_from_env() -> Optional[R2Config]:
@@ -214,13 +489,111 @@ def load_config_from_env() -> Optional[R2Config]:
         secret_key=secret_key,
         prefix=os.getenv("R2_PREFIX", ""),
         public_base_url=os.getenv("R2_PUBLIC_BASE_URL") or None,
+        unsigned_payload=os.getenv("R2_UNSIGNED_PAYLOAD", "").lower() in {"1", "true", "yes"},
     )
 
 
+@functools.cache
+def _check_hash_backend() -> bool:
+    """Log once whether SHA-256/HMAC run on OpenSSL (which uses SHA-NI/ARMv8 crypto
+    extensions where present) rather than CPython's builtin fallback."""
+    try:
+        import _hashlib
+    except ImportError:
+        _hashlib = None
+    openssl = (
+        _hashlib is not None
+        and hasattr(_hashlib, "openssl_sha256")
+        and type(hashlib.sha256()).__module__ == "_hashlib"
+    )
+    if openssl:
+        import ssl
+
+        logger.info("[R2] SHA-256 backend: %s", ssl.OPENSSL_VERSION)
+    else:
+        logger.warning("[R2] WARNING: hashlib is not using OpenSSL; SHA-256 signing will be slower")
+    return openssl
+
+
+def sha256_file(file_path: str) -> str:
+    """Hex SHA-256 of a file (the SigV4 payload hash)."""
+    return file_hexdigest(file_path, hashlib.sha256())
+
+
+def file_hexdigest(file_path: str, h: "hashlib._Hash") -> str:
+    """Feed a file to hasher h block by block and return the hex digest.
+
+    hashlib.file_digest reads into a reused buffer and releases the GIL for each
+    block, so hashing large media in a worker thread does not stall the event loop.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, lambda: h).hexdigest()
+
+
 def _sign(key: bytes, msg: str) -> bytes:
-    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+    # One-shot hmac.digest with a digest name takes OpenSSL's fast path
+    # without building an HMAC object. Keep HMAC here rather than inlining the
+    # ipad/opad construction: a Python-level XOR (even via bytes.translate) would
+    # only add work on top of the C implementation.
+    return hmac.digest(key, msg.encode("utf-8"), "sha256")
+
+
+@functools.lru_cache(maxsize=8)
+def get_uploader(config: R2Config, date_prefix: Optional[str] = None) -> R2Uploader:
+    """Shared R2Uploader per (config, date_prefix); uploaders hold no per-upload state."""
+    return R2Uploader(config, date_prefix=date_prefix)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_endpoint(endpoint: str) -> tuple[str, str]:
+    """(scheme, host) of an R2 endpoint URL."""
+    parsed = urlparse(endpoint)
+    if not parsed.scheme or not parsed.netloc:
+        raise ValueError("R2_ENDPOINT must be a valid URL")
+    return parsed.scheme, parsed.netloc
+
+
+@functools.lru_cache(maxsize=4)
+def _retry_policy(max_retries: int) -> Retry:
+    # max_retries counts attempts; urllib3 counts retries after the first one.
+    # Backoff: 0s, 4s, 8s... (urllib3 skips the sleep before the first retry).
+    # Retry objects are immutable (urllib3 derives a new one per retry), so one
+    # instance per attempt budget is shared by all uploads.
+    return Retry(
+        total=max_retries - 1,
+        backoff_factor=2,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"PUT"}),
+        raise_on_status=False,
+    )
+
+
+def _content_type(filename: str) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    content_type = CONTENT_TYPES.get(ext)
+    if content_type is None:
+        # Rare extensions only: mimetypes loads the system MIME tables on first use
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return content_type
+
+
+@functools.lru_cache(maxsize=1024)
+def _encode_uri_path(path: str) -> str:
+    """Encode URI path for AWS Signature V4.
+
+    Each path segment should be URL-encoded, but '/' should not be encoded.
+    """
+    return "".join([_URI_PATH_QUOTE[b] for b in path.encode("utf-8")])
+
+
+@functools.lru_cache(maxsize=4)
+def _credential_scope(date_stamp: str) -> str:
+    return f"{date_stamp}/auto/s3/aws4_request"
 
 
+# The derived key only changes with the UTC date (or the secret), so cache it
+# instead of running four HMACs per upload.
+@functools.lru_cache(maxsize=4)
 def _get_signature_key(key: str, date_stamp: str, region_name: str, service_name: str) -> bytes:
     k_date = _sign(("AWS4" + key).encode("utf-8"), date_stamp)
     k_region = _sign(k_date, region_name)
@@ -236,6 +609,7 @@ if __name__ == "__main__":
     parser.add_argument("file", help="local file path")
     parser.add_argument("--key", help="override object name/key")
     args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
 
     cfg = load_config_from_env()
     if not cfg:
@@ -1,10 +1,13 @@
 import json
+import logging
 import os
+import re
 import sys
 import asyncio
+import functools
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from crawl4ai import (
     AsyncWebCrawler,
@@ -14,6 +17,7 @@ from crawl4ai import (
     LLMConfig,
     LLMExtractionStrategy,
 )
+from playwright.async_api import Browser, Page
 from pydantic import BaseModel, Field
 
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -22,7 +26,9 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.append(str(REPO_ROOT))
 
 from apps.crawler.weibo_image_downloader import WeiboImageDownloader
-from apps.crawler.r2_uploader import R2Config, R2Uploader
+from apps.crawler.r2_uploader import R2Config, get_uploader
+
+logger = logging.getLogger(__name__)
 
 
 class WeiboPost(BaseModel):
@@ -67,6 +73,8 @@ class LLMSettings:
     base_url: str = "https://api.deepseek.com/v1"
     temperature: float = 0.3
     max_tokens: int = 2000
+    timeout_s: int = 60
+    max_retries: int = 2
     extra_headers: Optional[dict] = None
 
 
@@ -119,44 +127,21 @@ def build_instruction() -> str:
 """
 
 
-async def crawl_weibo(
-    url: str,
-    instruction: Optional[str] = None,
-    headless: bool = False,
-    download_media: bool = False,
-    llm_settings: LLMSettings = DEFAULT_LLM_SETTINGS,
-    r2_config: Optional[R2Config] = None,
-    date_prefix: Optional[str] = None,
-) -> List[dict]:
-    downloader = None
+class WeiboBatchPost(WeiboPost):
+    source_index: Optional[int] = Field(
+        None,
+        description="该微博所在页面的编号，即内容所在 <<<PAGE i ...>>> 标记中的 i",
+    )
 
-    try:
-        # 爬取阶段
-        browser_conf = BrowserConfig(
-            headless=headless,
-            viewport_width=1280,
-            viewport_height=2000,
-        )
 
-        # 构建 extra_args，如果有额外的 HTTP 头则添加
-        extra_args = {}
-        if llm_settings.extra_headers:
-            extra_args["extra_headers"] = llm_settings.extra_headers
-
-        extraction_strategy = LLMExtractionStrategy(
-            llm_config=build_llm_config(llm_settings),
-            schema=WeiboPost.model_json_schema(),
-            extraction_type="block",
-            instruction=instruction or build_instruction(),
-            apply_chunking=True,
-            chunk_token_threshold=4800,
-            overlap_rate=0.1,
-            input_format="html",
-            verbose=True,
-            extra_args=extra_args if extra_args else {},
-        )
+_WEIBO_UID_RE = re.compile(r"weibo\.com/(?:u/)?(\d+)")
 
-        c4a_script = r"""
+# 媒体下载阶段并发抓取帖子的页面数（每个页面独立 context，页面内查看器串行操作）
+MEDIA_FETCH_PAGES = 4
+# 媒体下载阶段并发处理上传的协程数
+MEDIA_UPLOAD_WORKERS = 4
+
+C4A_SCRIPT = r"""
 # 等待正文容器出现
 WAIT `#scroller` 8
 # 向下滑动3个页面高度以加载更多内容
@@ -172,67 +157,146 @@ EVAL `document.querySelectorAll('#scroller span.expand').forEach(el => el.click(
 WAIT `#scroller` 3
 """
 
-        run_conf = CrawlerRunConfig(
-            cache_mode=CacheMode.BYPASS,
-            scan_full_page=False,
-            scroll_delay=0.0,
-            process_iframes=True,
-            remove_overlay_elements=False,
-            extraction_strategy=extraction_strategy,
-            c4a_script=c4a_script,
-            delay_before_return_html=8.0,
-            css_selector="#scroller .vue-recycle-scroller__item-wrapper",
-        )
 
-        async with AsyncWebCrawler(config=browser_conf) as crawler:
-            result = await crawler.arun(url=url, config=run_conf)
+def _build_browser_config(headless: bool) -> BrowserConfig:
+    return BrowserConfig(
+        headless=headless,
+        viewport_width=1280,
+        viewport_height=2000,
+    )
 
-        if not result.success:
-            raise RuntimeError(f"爬取失败: {result.error_message}")
-
-        try:
-            posts_data = json.loads(result.extracted_content)
-        except json.JSONDecodeError as exc:
-            raise RuntimeError(f"JSON 解析失败: {exc}") from exc
-
-        # 图片下载阶段 - 使用图片下载器管理浏览器
-        if download_media and posts_data:
-            print(f"[Weibo] ========== Media Download Phase ==========")
-            print(
-                f"[Weibo] download_media={download_media}, posts_count={len(posts_data)}"
-            )
-            print(
-                f"[Weibo] r2_config={'configured' if r2_config else 'NOT configured'}"
-            )
 
-            images_dir = Path("images")
-            uploader = (
-                R2Uploader(r2_config, date_prefix=date_prefix) if r2_config else None
-            )
-            if uploader:
-                print(f"[Weibo] ✓ R2 uploader created with date_prefix={date_prefix}")
-            else:
-                print(f"[Weibo] ✗ R2 uploader NOT created (r2_config is None)")
+def _build_extraction_strategy(
+    llm_settings: LLMSettings,
+    instruction: str,
+    schema: type[BaseModel] = WeiboPost,
+) -> LLMExtractionStrategy:
+    # 构建 extra_args（会原样传给 litellm.completion）：
+    # crawl4ai 的 LLMConfig 不会转发 max_tokens，也没有超时/重试参数，需在此显式限制
+    extra_args = {
+        "max_tokens": llm_settings.max_tokens,
+        "timeout": llm_settings.timeout_s,
+        "num_retries": llm_settings.max_retries,
+    }
+    if llm_settings.extra_headers:
+        extra_args["extra_headers"] = llm_settings.extra_headers
+
+    return LLMExtractionStrategy(
+        llm_config=build_llm_config(llm_settings),
+        schema=schema.model_json_schema(),
+        extraction_type="block",
+        instruction=instruction,
+        apply_chunking=True,
+        chunk_token_threshold=4800,
+        overlap_rate=0.1,
+        input_format="html",
+        verbose=True,
+        extra_args=extra_args,
+    )
 
-            downloader = WeiboImageDownloader(
-                profile_url=url, download_dir=str(images_dir), r2_uploader=uploader
-            )
-            print(f"[Weibo] Starting media download to {images_dir}...")
 
-            # 启动浏览器并准备页面
-            await downloader.start_browser(headless=headless)
-            await downloader.prepare_page()
+def _build_run_config(
+    extraction_strategy: Optional[LLMExtractionStrategy] = None,
+) -> CrawlerRunConfig:
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        scan_full_page=False,
+        scroll_delay=0.0,
+        process_iframes=True,
+        remove_overlay_elements=False,
+        extraction_strategy=extraction_strategy,
+        c4a_script=C4A_SCRIPT,
+        delay_before_return_html=8.0,
+        css_selector="#scroller .vue-recycle-scroller__item-wrapper",
+    )
+
+
+def _build_batch_instruction(instruction: str, sources: List[Tuple[str, str]]) -> str:
+    pages = "\n".join(
+        f"- PAGE {i}: {author} ({url})" for i, (url, author) in enumerate(sources)
+    )
+    return f"""{instruction}
+
+本次输入合并了多个微博主页，每个主页的内容以 <<<PAGE i from author=...>>> 标记开头：
+{pages}
+
+- 对每条微博额外填写 source_index：该微博所在页面的编号 i
+- 不同页面的微博互不合并，分别生成 JSON 对象，最终仍只输出一个 JSON 数组
+"""
 
-            posts_with_media = 0
-            posts_without_media = 0
 
-            for i, post in enumerate(posts_data, 1):
+def _weibo_uid(url: str) -> Optional[str]:
+    m = _WEIBO_UID_RE.search(url or "")
+    return m.group(1) if m else None
+
+
+async def _download_posts_media(
+    posts_data: List[dict],
+    profile_url: str,
+    headless: bool,
+    r2_config: Optional[R2Config],
+    date_prefix: Optional[str],
+    browser: Optional[Browser] = None,
+) -> None:
+    """
+    图片下载阶段：按帖子下载媒体（并按需上传 R2），原地替换 media_urls。
+    传入 browser 时复用该浏览器，只为本次下载新建 context；需要查看器时才会启动/使用浏览器。
+    """
+    logger.info("[Weibo] ========== Media Download Phase ==========")
+    logger.info("[Weibo] profile=%s, posts_count=%s", profile_url, len(posts_data))
+    logger.info("[Weibo] r2_config=%s", "configured" if r2_config else "NOT configured")
+
+    images_dir = Path("images")
+    uploader = get_uploader(r2_config, date_prefix) if r2_config else None
+    if uploader:
+        logger.info("[Weibo] ✓ R2 uploader created with date_prefix=%s", date_prefix)
+    else:
+        logger.warning("[Weibo] ✗ R2 uploader NOT created (r2_config is None)")
+
+    downloader = WeiboImageDownloader(
+        profile_url=profile_url,
+        download_dir=str(images_dir),
+        r2_uploader=uploader,
+        browser=browser,
+    )
+    logger.info("[Weibo] Starting media download to %s...", images_dir)
+
+    try:
+        # 浏览器按需启动：本地已有副本或 CDN 直链能下载的图片都不需要查看器，
+        # 只有第一次真正要用查看器时才启动浏览器并加载主页
+        browser_lock = asyncio.Lock()
+
+        async def get_page(worker: int) -> Page:
+            async with browser_lock:
+                if not downloader.pages:
+                    logger.info("[Weibo] Viewer needed, starting browser...")
+                    await downloader.start_browser(headless=headless, pages=MEDIA_FETCH_PAGES)
+                    await downloader.prepare_page()
+            return downloader.pages[worker]
+
+        media_posts = [post.get("media_urls") for post in posts_data if post.get("media_urls")]
+        if all(downloader.all_downloaded(media_urls) for media_urls in media_posts):
+            logger.info("[Weibo] All media already downloaded, browser not needed")
+
+        posts_with_media = 0
+        posts_without_media = 0
+
+        # 流水线：每个页面的查看器只能串行抓取，多个页面各取一条帖子并行抓取；每张图保存后
+        # 即在后台开始上传 R2，抓完一条帖子就交给上传协程等待结果
+        queue: asyncio.Queue[
+            Optional[Tuple[dict, List[str], Dict[int, asyncio.Task[str]]]]
+        ] = asyncio.Queue()
+        pending_posts = list(enumerate(posts_data, 1))
+        pending_posts.reverse()
+
+        async def produce(worker: int) -> None:
+            nonlocal posts_with_media, posts_without_media
+            while pending_posts:
+                i, post = pending_posts.pop()
                 media_urls = post.get("media_urls")
                 if not media_urls:
                     posts_without_media += 1
-                    print(
-                        f"[Weibo] Post {i}/{len(posts_data)}: No media_urls, skipping"
-                    )
+                    logger.info("[Weibo] Post %s/%s: No media_urls, skipping", i, len(posts_data))
                     continue
 
                 posts_with_media += 1
@@ -240,27 +304,166 @@ WAIT `#scroller` 3
                 post_id = post_url.split("/")[-1] if post_url else f"post_{i}"
                 post_title = post.get("title", "")[:50]
 
-                print(f"\n[Weibo] Post {i}/{len(posts_data)}: {post_title}")
-                print(f"[Weibo]   ID: {post_id}")
-                print(f"[Weibo]   Media URLs: {len(media_urls)} items")
-                print(f"[Weibo]   Original URLs: {media_urls[:2]}...")
+                logger.info("\n[Weibo] Post %s/%s: %s", i, len(posts_data), post_title)
+                logger.debug("[Weibo]   ID: %s", post_id)
+                logger.info("[Weibo]   Media URLs: %s items", len(media_urls))
+                logger.debug("[Weibo]   Original URLs: %s...", media_urls[:2])
+
+                saved_paths, uploads = await downloader.fetch_media_list(
+                    media_urls, post_id, get_page=functools.partial(get_page, worker)
+                )
+                await queue.put((post, saved_paths, uploads))
+
+        async def produce_all() -> None:
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for worker in range(MEDIA_FETCH_PAGES):
+                        tg.create_task(produce(worker))
+            finally:
+                # 通知所有上传协程结束
+                for _ in range(MEDIA_UPLOAD_WORKERS):
+                    queue.put_nowait(None)
+
+        async def consume() -> None:
+            while (item := await queue.get()) is not None:
+                post, saved_paths, uploads = item
+                local_paths = await downloader.upload_media_list(saved_paths, uploads)
+                logger.debug("[Weibo]   Downloaded paths: %s...", local_paths[:2])
+                post["media_urls"] = local_paths
+
+        # TaskGroup：任一协程失败时取消并等待其余协程，避免关闭浏览器时仍有协程在使用页面
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(produce_all())
+            for _ in range(MEDIA_UPLOAD_WORKERS):
+                tg.create_task(consume())
 
-                local_paths = await downloader.download_media_list(media_urls, post_id)
+        logger.info("\n[Weibo] ========== Media Download Summary ==========")
+        logger.info("[Weibo] Total posts: %s", len(posts_data))
+        logger.info("[Weibo] Posts with media: %s", posts_with_media)
+        logger.info("[Weibo] Posts without media: %s", posts_without_media)
+    finally:
+        # 清理浏览器资源（close_browser 会先取消并等待未完成的上传任务）
+        await downloader.close_browser()
 
-                print(f"[Weibo]   Downloaded paths: {local_paths[:2]}...")
-                post["media_urls"] = local_paths
 
-            print(f"\n[Weibo] ========== Media Download Summary ==========")
-            print(f"[Weibo] Total posts: {len(posts_data)}")
-            print(f"[Weibo] Posts with media: {posts_with_media}")
-            print(f"[Weibo] Posts without media: {posts_without_media}")
+async def crawl_weibo(
+    url: str,
+    instruction: Optional[str] = None,
+    headless: bool = False,
+    download_media: bool = False,
+    llm_settings: LLMSettings = DEFAULT_LLM_SETTINGS,
+    r2_config: Optional[R2Config] = None,
+    date_prefix: Optional[str] = None,
+    browser: Optional[Browser] = None,
+) -> List[dict]:
+    # 爬取阶段
+    extraction_strategy = _build_extraction_strategy(
+        llm_settings, instruction or build_instruction()
+    )
+    run_conf = _build_run_config(extraction_strategy)
+
+    async with AsyncWebCrawler(config=_build_browser_config(headless)) as crawler:
+        result = await crawler.arun(url=url, config=run_conf)
 
-        return posts_data
+    if not result.success:
+        raise RuntimeError(f"爬取失败: {result.error_message}")
 
-    finally:
-        # 清理浏览器资源
-        if downloader:
-            await downloader.close_browser()
+    try:
+        posts_data = json.loads(result.extracted_content)
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(f"JSON 解析失败: {exc}") from exc
+
+    # 图片下载阶段 - 使用图片下载器管理浏览器
+    if download_media and posts_data:
+        await _download_posts_media(
+            posts_data, url, headless, r2_config, date_prefix, browser=browser
+        )
+
+    return posts_data
+
+
+async def crawl_weibo_batch(
+    sources: List[Tuple[str, str]],
+    instruction: Optional[str] = None,
+    headless: bool = False,
+    download_media: bool = False,
+    llm_settings: LLMSettings = DEFAULT_LLM_SETTINGS,
+    r2_config: Optional[R2Config] = None,
+    date_prefix: Optional[str] = None,
+    browser: Optional[Browser] = None,
+) -> List[List[dict]]:
+    """
+    多个微博主页共用一次 LLM 抽取：并发抓取各主页 HTML，合并为一个带页面标记的输入，
+    提示词（含已有文章去重列表）只发送一次。
+
+    sources 为 (主页 URL, 作者) 列表，返回与 sources 一一对应的帖子列表。
+    browser 为可选的共享浏览器，用于媒体下载阶段。
+    """
+    if len(sources) == 1:
+        url, _ = sources[0]
+        posts = await crawl_weibo(
+            url=url,
+            instruction=instruction,
+            headless=headless,
+            download_media=download_media,
+            llm_settings=llm_settings,
+            r2_config=r2_config,
+            date_prefix=date_prefix,
+            browser=browser,
+        )
+        return [posts]
+
+    # 爬取阶段：只抓页面，不做抽取；多个页面共享同一个浏览器
+    run_conf = _build_run_config()
+    async with AsyncWebCrawler(config=_build_browser_config(headless)) as crawler:
+        results = await asyncio.gather(
+            *(crawler.arun(url=url, config=run_conf) for url, _ in sources)
+        )
+
+    sections: List[str] = []
+    for i, ((url, author), result) in enumerate(zip(sources, results)):
+        if not result.success:
+            logger.error("[Weibo] ✗ 爬取失败 %s: %s", url, result.error_message)
+            continue
+        sections.append(f"<<<PAGE {i} from author={author}>>>\n{result.html}")
+
+    if not sections:
+        raise RuntimeError("爬取失败: 所有页面均未成功加载")
+
+    # 抽取阶段：一次 LLM 抽取覆盖所有页面
+    extraction_strategy = _build_extraction_strategy(
+        llm_settings,
+        _build_batch_instruction(instruction or build_instruction(), sources),
+        schema=WeiboBatchPost,
+    )
+    batch_url = ", ".join(url for url, _ in sources)
+    extracted = await extraction_strategy.arun(batch_url, sections)
+
+    # 分发阶段：优先按帖子 URL 中的用户 ID 归属，其次使用 LLM 填写的 source_index
+    uid_to_index = {_weibo_uid(url): i for i, (url, _) in enumerate(sources)}
+    uid_to_index.pop(None, None)
+    grouped: List[List[dict]] = [[] for _ in sources]
+    for post in extracted:
+        if not isinstance(post, dict) or post.get("error"):
+            continue
+        source_index = post.pop("source_index", None)
+        index = uid_to_index.get(_weibo_uid(post.get("url", "")), source_index)
+        if not isinstance(index, int) or not 0 <= index < len(sources):
+            logger.warning(
+                "[Weibo] ✗ 无法判断所属主页，跳过: %s", post.get("url") or post.get("title")
+            )
+            continue
+        grouped[index].append(post)
+
+    # 图片下载阶段：下载器需要在各自主页上定位缩略图
+    if download_media:
+        for (url, _), posts_data in zip(sources, grouped):
+            if posts_data:
+                await _download_posts_media(
+                    posts_data, url, headless, r2_config, date_prefix, browser=browser
+                )
+
+    return grouped
 
 
 async def main():
@@ -279,4 +482,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
     asyncio.run(main())
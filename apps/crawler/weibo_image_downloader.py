@@ -2,16 +2,159 @@
 """
 Weibo Image Downloader
 Downloads all images from a Weibo user profile page.
+
+Environment variables (optional):
+  CHROMIUM_NO_SANDBOX     set to 1 to launch Chromium with --no-sandbox (only for
+                          container runs as root, where the sandbox cannot start)
 """
 
 import asyncio
 import os
 import re
+from collections.abc import Awaitable, Callable
 from pathlib import Path
-from urllib.parse import urlparse
+import aiofiles
 import httpx
-from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
-from apps.crawler.r2_uploader import R2Uploader
+import orjson
+import xxhash
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from apps.crawler.r2_uploader import R2Uploader, file_hexdigest
+
+# Max concurrent R2 uploads per downloader
+UPLOAD_CONCURRENCY = 8
+
+# Read size for streaming image downloads to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Weibo CDN size segments; swapping one for /large/ addresses the original image
+_SIZE_SEGMENT_RE = re.compile(r"/(orj360|orj480|bmiddle|thumb150|thumb180|wap180|mw690|mw2000)/")
+
+# Chromium flags for a scraping-only browser: no GPU, extensions or background
+# throttling, which trims helper processes and resident memory. The sandbox stays on
+# unless explicitly disabled, since the pages rendered are third-party content.
+CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-features=TranslateUI,BlinkGenPropertyTrees",
+    "--disable-extensions",
+    "--mute-audio",
+]
+if os.getenv("CHROMIUM_NO_SANDBOX") == "1":
+    CHROMIUM_ARGS.append("--no-sandbox")
+
+# Resources the downloader never needs; aborted before they are fetched
+BLOCKED_RESOURCES = "**/*.{woff,woff2,ttf,mp4}"
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Builds window.__wbIndex: thumbnail filename -> picture container, in one DOM pass
+_BUILD_THUMBNAIL_INDEX_JS = """
+    const buildIndex = () => {
+        const index = new Map();
+        for (const container of document.querySelectorAll('.woo-picture-main.woo-picture-hover')) {
+            const src = container.querySelector('img')?.src;
+            if (src) index.set(new URL(src).pathname.split('/').pop(), container);
+        }
+        window.__wbIndex = index;
+        return index;
+    };
+"""
+
+# Looks the thumbnail up in the index (rebuilding it when the entry is missing or was
+# recycled by the virtual scroller), then scrolls to and clicks it.
+_CLICK_THUMBNAIL_JS = """
+(fragment) => {
+""" + _BUILD_THUMBNAIL_INDEX_JS + """
+    const key = fragment.split('?')[0].split('/').pop();
+    const matches = (c) => c?.isConnected && c.querySelector('img')?.src?.includes(fragment);
+    let container = window.__wbIndex?.get(key);
+    if (!matches(container)) container = buildIndex().get(key);
+    if (!matches(container)) return false;
+    container.scrollIntoView({ behavior: 'instant', block: 'center' });
+    container.click();
+    return true;
+}
+"""
+
+# Scrolls to a multiple of the viewport height (or by a pixel offset) and returns how
+# many picture containers were rendered before scrolling
+_SCROLL_JS = """
+({ pages, by }) => {
+    const count = document.querySelectorAll('.woo-picture-main').length;
+    if (pages) window.scrollTo(0, window.innerHeight * pages);
+    else window.scrollBy(0, by);
+    return count;
+}
+"""
+
+
+def _xpath_literal(text: str) -> str:
+    """Quote `text` as an XPath 1.0 string literal (which has no escape sequences)."""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _text_xpath(text: str) -> str:
+    """XPath for elements with an own text node that is exactly `text` (ignoring whitespace).
+
+    Every text node is checked, so labels placed after an icon or a whitespace node
+    still match.
+    """
+    return f"//*[text()[normalize-space()={_xpath_literal(text)}]]"
+
+
+# Viewer controls, matched by exact label instead of get_by_text's substring text scan
+SEL_DOWNLOAD = "xpath=" + _text_xpath("下载保存")
+SEL_CLOSE_VIEWER = "xpath=" + _text_xpath("关闭弹层")
+SEL_VIEW_LARGE = "xpath=" + _text_xpath("查看大图")
+SEL_ORIGINAL = "xpath=" + _text_xpath("原图")
+
+# Clicks every element whose own text is "收起" in one pass; returns how many were clicked
+_COLLAPSE_SECTIONS_JS = """
+() => {
+    const found = document.evaluate(
+        """ + orjson.dumps(_text_xpath("收起")).decode() + """, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    for (let i = 0; i < found.snapshotLength; i++) found.snapshotItem(i).click();
+    return found.snapshotLength;
+}
+"""
+
+_INDEX_THUMBNAILS_JS = "() => {" + _BUILD_THUMBNAIL_INDEX_JS + "    return buildIndex().size;\n}"
+
+
+def _content_digest(file_path: str) -> str:
+    """Dedup key for a media file.
+
+    Internal only, so the non-cryptographic XXH3-128 is used instead of SHA-256; the
+    SHA-256 required for signing is computed only for content that actually gets uploaded.
+    """
+    return file_hexdigest(file_path, xxhash.xxh3_128())
+
+
+def _image_key(url: str) -> str:
+    """Dedup key for a Weibo image URL: the filename, which is the same across every size variant.
+
+    CDN URLs have a fixed ``.../<size>/<filename>`` shape, so plain string splits
+    stand in for urlparse on this per-image path.
+    """
+    return url.split("?", 1)[0].split("#", 1)[0].rsplit("/", 1)[-1]
+
+
+def _original_image_url(url: str) -> str:
+    """Rewrite a sinaimg thumbnail URL to its original-size variant."""
+    return _SIZE_SEGMENT_RE.sub("/large/", url, count=1)
+
+
+async def _abort_route(route) -> None:
+    await route.abort()
 
 
 class WeiboImageDownloader:
@@ -20,49 +163,107 @@ class WeiboImageDownloader:
         profile_url: str,
         download_dir: str = "./weibo_images",
         r2_uploader: R2Uploader | None = None,
+        browser: Browser | None = None,
     ):
         self.profile_url = profile_url
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
-        self.downloaded_urls = set()
+        # Image key (see _image_key) -> local path, shared by every post of this downloader
+        self.downloaded_files: dict[str, str] = {}
+        # Append-only record of downloaded_files, so repeat runs skip images already on disk
+        self.seen_index_path = self.download_dir / ".seen.jsonl"
+        # Image key -> CDN URL observed in the page's network traffic
+        self.seen_image_urls: dict[str, str] = {}
         self.r2_uploader = r2_uploader
+        # Content hash -> upload task, so identical media (reposts, shared artwork)
+        # is uploaded once per downloader and every post reuses the same URL.
+        self._uploads_by_digest: dict[str, asyncio.Task[str]] = {}
+        self._upload_sem = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+        # Upload tasks started by fetch_media_list() that have not finished yet
+        self._pending_uploads: set[asyncio.Task[str]] = set()
         self.playwright = None
-        self.browser = None
+        # A shared browser passed in by the caller is only borrowed: we open our own
+        # context on it and leave closing the browser to its owner.
+        self.browser = browser
+        self._owns_browser = browser is None
         self.context = None
         self.page = None
+        # One context+page per parallel post worker; context/page above are the first of each
+        self.contexts: list[BrowserContext] = []
+        self.pages: list[Page] = []
+        # Cookies/localStorage saved by close_browser() and restored by start_browser(),
+        # so later runs reuse Weibo's session instead of warming it up again
+        self.storage_state_path = self.download_dir / "weibo_state.json"
+        # Shared HTTP client for direct image downloads, opened in start_browser()
+        self._client: httpx.AsyncClient | None = None
+        # Loaded up front so callers can tell, before starting a browser, whether it is needed
+        self._load_seen_index()
 
     async def download_image(self, image_url: str, filename: str, dest_dir: Path | None = None) -> str | None:
         """Download an image from URL to local file. Returns the local file path on success."""
+        result = await self.download_image_content(image_url, filename, dest_dir)
+        return result[0] if result else None
+
+    async def download_image_content(
+        self, image_url: str, filename: str, dest_dir: Path | None = None, keep_bytes: bool = False
+    ) -> tuple[str, bytearray | None] | None:
+        """Like download_image(), but with `keep_bytes` also returns the downloaded bytes so
+        they can be uploaded without reading the file back. The bytes are None when the file
+        was already on disk, `keep_bytes` is false or no uploader is configured.
+        """
         target_dir = dest_dir or self.download_dir
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        if image_url in self.downloaded_urls:
+        existing = self.downloaded_files.get(_image_key(image_url))
+        if existing and os.path.exists(existing):
             print(f"Already downloaded: {filename}")
-            filepath = target_dir / filename
-            if filepath.exists():
-                return str(filepath)
-            return None
-
-        try:
-            headers = {
-                "Referer": self.profile_url,
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            }
+            return existing, None
 
-            original_url = re.sub(r"/(orj360|bmiddle)/", "/mw2000/", image_url)
+        if self._client is None:
+            self._client = self._new_http_client()
 
-            async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
-                response = await client.get(original_url)
+        filepath = target_dir / filename
+        # Written under a temporary name and renamed only once complete, so an interrupted
+        # download never looks like a finished file
+        part_path = filepath.with_name(filepath.name + ".part")
+        try:
+            original_url = _original_image_url(image_url)
+
+            # Stream to disk so writes don't block the loop; the bytes are only kept
+            # in memory when the caller will hand them to an uploader.
+            content = bytearray() if keep_bytes and self.r2_uploader else None
+            size = 0
+            async with self._client.stream(
+                "GET", original_url, headers={"Referer": self.profile_url}
+            ) as response:
                 response.raise_for_status()
-
-                filepath = target_dir / filename
-                filepath.write_bytes(response.content)
-                self.downloaded_urls.update({image_url, original_url})
-                print(f"Downloaded: {filename} ({len(response.content)} bytes)")
-                return str(filepath)
+                async with aiofiles.open(part_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+                        size += len(chunk)
+                        if content is not None:
+                            content += chunk
+            os.replace(part_path, filepath)
+
+            self._remember_download(image_url, str(filepath))
+            print(f"Downloaded: {filename} ({size} bytes)")
+            return str(filepath), content
         except Exception as e:
             print(f"Error downloading {filename}: {e}")
             return None
+        finally:
+            # No-op after a successful rename; removes the partial file otherwise
+            part_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _new_http_client() -> httpx.AsyncClient:
+        """HTTP/2 client with keep-alive, so consecutive downloads from the sinaimg CDN share connections."""
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
 
     async def download_via_browser(self, page: Page, filename: str, dest_dir: Path | None = None) -> str | None:
         """
@@ -72,14 +273,19 @@ class WeiboImageDownloader:
         target_dir = dest_dir or self.download_dir
         target_dir.mkdir(parents=True, exist_ok=True)
         try:
-            download_button = page.get_by_text("下载保存")
+            download_button = page.locator(SEL_DOWNLOAD).first
             async with page.expect_download(timeout=15000) as download_info:
                 await download_button.click()
 
             download = await download_info.value
             suggested = download.suggested_filename or filename
             filepath = target_dir / suggested
-            await download.save_as(str(filepath))
+            # Move Playwright's temp file into place instead of copying it; fall back to
+            # save_as when the temp dir is on another filesystem.
+            try:
+                os.replace(await download.path(), filepath)
+            except OSError:
+                await download.save_as(str(filepath))
             print(f"Downloaded via browser: {filepath.name}")
             return str(filepath)
         except Exception as e:
@@ -110,10 +316,13 @@ class WeiboImageDownloader:
         try:
             # New viewer provides a "关闭弹层" entry; fall back to Escape when not present.
             try:
-                await page.get_by_text("关闭弹层").click(timeout=2000)
+                await page.locator(SEL_CLOSE_VIEWER).first.click(timeout=2000)
             except Exception:
                 await page.keyboard.press('Escape')
-            await asyncio.sleep(0.5)
+            try:
+                await page.locator(".imgInstance").first.wait_for(state="hidden", timeout=2000)
+            except PlaywrightTimeoutError:
+                pass
 
         except Exception as e:
             print(f"Error closing viewer: {e}")
@@ -121,78 +330,47 @@ class WeiboImageDownloader:
     async def collapse_expanded_sections(self, page: Page):
         """Collapse any expanded picture toolbars/sections to avoid interfering with later items."""
         try:
-            buttons = page.get_by_text("收起")
-            count = await buttons.count()
-            for i in range(count):
-                try:
-                    await buttons.nth(i).click(timeout=1000)
-                except Exception:
-                    continue
+            count = await page.evaluate(_COLLAPSE_SECTIONS_JS)
+            if count:
+                await self.index_thumbnails(page)
         except Exception as e:
             print(f"Error collapsing sections: {e}")
 
+    async def index_thumbnails(self, page: Page) -> int:
+        """(Re)build the in-page thumbnail index used by process_image_by_url(); returns its size."""
+        return await page.evaluate(_INDEX_THUMBNAILS_JS)
+
     async def process_image_by_url(self, page: Page, match_fragment: str, index: int, dest_dir: Path | None = None):
         """Process a single image by finding it via a thumbnail URL or filename fragment."""
-        try:
-            # Find the image element by its thumbnail URL
-            target_element = await page.evaluate("""
-                (fragment) => {
-                    const containers = document.querySelectorAll('.woo-picture-main.woo-picture-hover');
-                    for (const container of containers) {
-                        const img = container.querySelector('img');
-                        if (img && img.src && img.src.includes(fragment)) {
-                            return container;
-                        }
-                    }
-                    return null;
-                }
-            """, match_fragment)
+        saved_path, _ = await self._process_image(page, match_fragment, index, dest_dir)
+        return saved_path
 
-            if not target_element:
-                print(f"Image {index}: Element not found for fragment {match_fragment}")
-                return
-
-            # Use JavaScript to scroll and click the element
-            await page.evaluate("""
-                (fragment) => {
-                    const containers = document.querySelectorAll('.woo-picture-main.woo-picture-hover');
-                    for (const container of containers) {
-                        const img = container.querySelector('img');
-                        if (img && img.src && img.src.includes(fragment)) {
-                            container.scrollIntoView({ behavior: 'smooth', block: 'center' });
-                            return true;
-                        }
-                    }
-                    return false;
-                }
-            """, match_fragment)
-            await asyncio.sleep(1)
-
-            # Click using JavaScript for reliability
-            clicked = await page.evaluate("""
-                (fragment) => {
-                    const containers = document.querySelectorAll('.woo-picture-main.woo-picture-hover');
-                    for (const container of containers) {
-                        const img = container.querySelector('img');
-                        if (img && img.src && img.src.includes(fragment)) {
-                            container.click();
-                            return true;
-                        }
-                    }
-                    return false;
-                }
-            """, match_fragment)
+    async def _process_image(
+        self, page: Page, match_fragment: str, index: int, dest_dir: Path | None = None
+    ) -> tuple[str | None, bytearray | None]:
+        """process_image_by_url(), but also returns the downloaded bytes (see download_image_content())."""
+        try:
+            # Locate, scroll to and click the thumbnail in a single round-trip
+            clicked = await page.evaluate(_CLICK_THUMBNAIL_JS, match_fragment)
 
             if not clicked:
-                print(f"Image {index}: Failed to click element for fragment {match_fragment}")
-                return
+                print(f"Image {index}: Element not found for fragment {match_fragment}")
+                return None, None
 
-            await asyncio.sleep(2)
+            # The viewer image is the readiness signal; if it never shows, there is nothing to fetch
+            try:
+                await page.locator(".imgInstance img, .picture-viewer_imgWrap_ICKHT img").first.wait_for(
+                    state="visible", timeout=5000
+                )
+            except PlaywrightTimeoutError:
+                print(f"Image {index}: Viewer did not open for fragment {match_fragment}")
+                await self.close_viewer(page)
+                return None, None
 
             # Enter the fullscreen viewer to reveal original-size controls
             try:
-                await page.get_by_text("查看大图").click(timeout=3000)
-                await asyncio.sleep(0.5)
+                await page.locator(SEL_VIEW_LARGE).first.click(timeout=3000)
+                await page.locator(SEL_ORIGINAL).first.wait_for(state="visible", timeout=3000)
             except Exception:
                 pass
 
@@ -200,7 +378,7 @@ class WeiboImageDownloader:
             popup_url = None
             try:
                 async with page.context.expect_page(timeout=5000) as popup_info:
-                    await page.get_by_text("原图").click(timeout=3000)
+                    await page.locator(SEL_ORIGINAL).first.click(timeout=3000)
                 popup_page = await popup_info.value
                 await popup_page.wait_for_load_state("load", timeout=5000)
                 popup_url = popup_page.url
@@ -212,200 +390,410 @@ class WeiboImageDownloader:
 
             if image_url:
                 # Generate filename from URL
-                parsed_url = urlparse(image_url)
-                filename = os.path.basename(parsed_url.path)
+                filename = _image_key(image_url)
                 if not filename:
                     filename = f"image_{index}.jpg"
 
                 # Check if already downloaded
-                if image_url in self.downloaded_urls:
+                existing = self.downloaded_files.get(_image_key(image_url))
+                if existing and os.path.exists(existing):
                     print(f"Image {index}: already downloaded")
-                    # Try to find the existing file
-                    target_dir = dest_dir or self.download_dir
-                    existing_file = target_dir / filename
-                    if existing_file.exists():
-                        await self.close_viewer(page)
-                        return str(existing_file)
-                    # If file doesn't exist, continue with download
-
-                saved_path = None
-                # If clicking原图 opened a direct URL, download it; otherwise use viewer button fallback.
-                if popup_url:
-                    saved_path = await self.download_image(image_url, filename, dest_dir)
-                else:
-                    downloaded_path = await self.download_via_browser(page, filename, dest_dir)
-                    if not downloaded_path:
-                        saved_path = await self.download_image(image_url, filename, dest_dir)
-                    else:
-                        self.downloaded_urls.add(image_url)
-                        saved_path = downloaded_path
+                    await self.close_viewer(page)
+                    return existing, None
+                # If file doesn't exist, continue with download
+
+                # A direct GET of the real URL is far cheaper than the viewer's download
+                # button, which is only used when the GET fails.
+                fetched = await self.download_image_content(image_url, filename, dest_dir, keep_bytes=True)
+                saved_path, content = fetched or (None, None)
+                if not saved_path:
+                    saved_path = await self.download_via_browser(page, filename, dest_dir)
+                    if saved_path:
+                        self._remember_download(image_url, saved_path)
             else:
                 print(f"Image {index}: Could not extract URL")
-                saved_path = None
+                saved_path, content = None, None
 
             # Close the viewer
             await self.close_viewer(page)
-            await asyncio.sleep(0.5)
             await self.collapse_expanded_sections(page)
-            return saved_path
+            return saved_path, content
         except Exception as e:
             print(f"Error processing image {index}: {e}")
             # Try to close viewer in case of error
             await self.close_viewer(page)
             await self.collapse_expanded_sections(page)
-            return None
+            return None, None
 
     async def scroll_and_load_content(self, page: Page, scroll_times: int = 5):
-        """Scroll down the page to load more content."""
-        print(f"Scrolling to load more content...")
+        """Scroll down the page to load more content, stopping early once nothing new loads."""
+        print("Scrolling to load more content...")
         for i in range(scroll_times):
-            await page.evaluate("window.scrollBy(0, 1000)")
-            await asyncio.sleep(1.5)
-        print(f"Scrolling complete")
-
-    async def start_browser(self, headless: bool = False):
-        """Start browser instance with viewport matching crawl4ai (1280x2000)."""
-        if self.playwright is None:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=headless)
-            self.context = await self.browser.new_context(
-                viewport={"width": 1280, "height": 2000},
-                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            if not await self._scroll_and_wait(page, by=1000):
+                print(f"No new content after {i + 1} scrolls, stopping")
+                break
+        await self.index_thumbnails(page)
+        print("Scrolling complete")
+
+    def _record_image_response(self, response) -> None:
+        """Remember every CDN image the page loads, as a fallback source for direct downloads."""
+        url = response.url
+        if "sinaimg.cn" in url and "/emoticon/" not in url and response.ok:
+            self.seen_image_urls[_image_key(url)] = url
+
+    def _direct_urls(self, media_url: str, key: str) -> list[str]:
+        """Original-size CDN URLs to try before the viewer: the post's own URL, then the
+        same image as seen in page traffic."""
+        candidates = (media_url, self.seen_image_urls.get(key))
+        return list(dict.fromkeys(_original_image_url(u) for u in candidates if u and "sinaimg.cn" in u))
+
+    async def _scroll_and_wait(self, page: Page, *, pages: int = 0, by: int = 0, timeout: int = 2000) -> bool:
+        """Scroll to `pages` viewport heights (or by `by` pixels), then wait until more picture containers render.
+
+        Returns True as soon as lazy-loaded content shows up, or False when the scroll
+        revealed nothing new within the timeout.
+        """
+        before = await page.evaluate(_SCROLL_JS, {"pages": pages, "by": by})
+        try:
+            await page.wait_for_function(
+                "(n) => document.querySelectorAll('.woo-picture-main').length > n",
+                arg=before,
+                timeout=timeout,
             )
-            self.page = await self.context.new_page()
-            print(f"[Downloader] Browser started with viewport 1280x2000")
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    def local_copy(self, media_url: str) -> str | None:
+        """Path of an existing local download of this image (any size variant), if any."""
+        path = self.downloaded_files.get(_image_key(media_url))
+        return path if path and os.path.exists(path) else None
+
+    def all_downloaded(self, media_urls: list[str]) -> bool:
+        """Whether every item already has a local copy, so no fetch or viewer is needed."""
+        return all(self.local_copy(url) for url in media_urls)
+
+    def _remember_download(self, image_url: str, path: str) -> None:
+        """Record a finished download in memory and in the on-disk seen index."""
+        key = _image_key(image_url)
+        self.downloaded_files[key] = path
+        try:
+            with open(self.seen_index_path, "ab") as f:
+                f.write(orjson.dumps({"key": key, "path": path, "size": os.path.getsize(path)}) + b"\n")
+        except OSError as e:
+            print(f"[Downloader] Failed to update seen index: {e}")
+
+    def _load_seen_index(self) -> None:
+        """Load downloads recorded by earlier runs whose files are still on disk.
+
+        The index is then compacted to those entries, dropping stale, duplicate and
+        malformed lines so it does not grow without bound.
+        """
+        try:
+            lines = self.seen_index_path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return
+        records: dict[str, dict] = {}
+        for line in lines:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue  # tolerate a torn last line from an interrupted run
+            if not isinstance(record, dict):
+                continue
+            key, path = record.get("key"), record.get("path")
+            if isinstance(key, str) and isinstance(path, str) and os.path.exists(path):
+                records[key] = record
+        for key, record in records.items():
+            self.downloaded_files[key] = record["path"]
+        print(f"[Downloader] Loaded {len(records)} previously downloaded images from {self.seen_index_path}")
+
+        if len(records) != len(lines):
+            tmp_path = self.seen_index_path.with_name(self.seen_index_path.name + ".tmp")
+            try:
+                tmp_path.write_bytes(b"".join(orjson.dumps(r) + b"\n" for r in records.values()))
+                os.replace(tmp_path, self.seen_index_path)
+            except OSError as e:
+                print(f"[Downloader] Failed to compact seen index: {e}")
+
+    async def start_browser(self, headless: bool = False, pages: int = 1):
+        """Start browser instance with viewport matching crawl4ai (1280x2000).
+
+        `pages` isolated contexts are opened so that many posts can be fetched in
+        parallel, each on its own page. When a shared browser was provided, only the
+        contexts are created on it.
+        """
+        if self.context is None:
+            if self.browser is None:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+            storage_state = str(self.storage_state_path) if self.storage_state_path.exists() else None
+            for _ in range(max(pages, 1)):
+                context = await self.browser.new_context(
+                    viewport={"width": 1280, "height": 2000},
+                    user_agent=USER_AGENT,
+                    storage_state=storage_state,
+                )
+                await context.route(BLOCKED_RESOURCES, _abort_route)
+                page = await context.new_page()
+                page.on("response", self._record_image_response)
+                self.contexts.append(context)
+                self.pages.append(page)
+            self.context = self.contexts[0]
+            self.page = self.pages[0]
+            print(f"[Downloader] Browser started with {len(self.pages)} page(s), viewport 1280x2000")
+        if self._client is None:
+            self._client = self._new_http_client()
+
+    async def cancel_uploads(self) -> None:
+        """Cancel and wait for any uploads nobody awaited (e.g. after a failed fetch)."""
+        tasks = [*self._pending_uploads, *self._uploads_by_digest.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending_uploads.clear()
 
     async def close_browser(self):
-        """Close browser instance."""
-        if self.browser:
+        """Close browser instance (or just our context when the browser is shared)."""
+        await self.cancel_uploads()
+        if self.context:
+            try:
+                await self.context.storage_state(path=str(self.storage_state_path))
+            except Exception as e:
+                print(f"[Downloader] Failed to save storage state: {e}")
+        for context in self.contexts:
+            await context.close()
+        if self._owns_browser and self.browser:
             await self.browser.close()
             self.browser = None
         if self.playwright:
             await self.playwright.stop()
             self.playwright = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
         self.context = None
         self.page = None
-        print(f"[Downloader] Browser closed")
+        self.contexts.clear()
+        self.pages.clear()
+        print("[Downloader] Browser closed")
 
     async def prepare_page(self):
-        """Navigate to profile URL and scroll 3 page heights to load content."""
+        """Navigate every page to the profile URL and scroll 3 page heights to load content."""
         if not self.page:
             raise RuntimeError("Browser not started. Call start_browser() first.")
 
         print(f"[Downloader] Navigating to {self.profile_url}")
-        await self.page.goto(self.profile_url, wait_until="domcontentloaded", timeout=60000)
-        await self.page.wait_for_selector(".vue-recycle-scroller__item-wrapper", timeout=30000)
+        await asyncio.gather(*(self._prepare_one(page) for page in self.pages))
+
+    async def _prepare_one(self, page: Page):
+        await page.goto(self.profile_url, wait_until="domcontentloaded", timeout=60000)
+        await page.wait_for_selector(".vue-recycle-scroller__item-wrapper", timeout=30000)
 
         # Scroll 3 page heights to load more content (matching crawl4ai behavior)
-        print(f"[Downloader] Scrolling 3 page heights to load content...")
-        await self.page.evaluate("window.scrollTo(0, window.innerHeight);")
-        await asyncio.sleep(2)
-        await self.page.evaluate("window.scrollTo(0, window.innerHeight * 2);")
-        await asyncio.sleep(2)
-        await self.page.evaluate("window.scrollTo(0, window.innerHeight * 3);")
-        await asyncio.sleep(2)
-        print(f"[Downloader] Page prepared and content loaded")
-
-    async def download_media_list(self, media_urls: list[str], post_id: str) -> list[str]:
+        for pages in range(1, 4):
+            await self._scroll_and_wait(page, pages=pages)
+        indexed = await self.index_thumbnails(page)
+        print(f"[Downloader] Page prepared and content loaded ({indexed} thumbnails indexed)")
+
+    async def download_media_list(self, media_urls: list[str], post_id: str, page: Page | None = None) -> list[str]:
         """Download all media in a post using filename fragments to locate thumbnails."""
-        if not self.page:
-            raise RuntimeError("Browser not started. Call start_browser() and prepare_page() first.")
+        saved_paths, uploads = await self.fetch_media_list(media_urls, post_id, page)
+        return await self.upload_media_list(saved_paths, uploads)
 
+    async def fetch_media_list(
+        self,
+        media_urls: list[str],
+        post_id: str,
+        page: Page | None = None,
+        get_page: Callable[[], Awaitable[Page]] | None = None,
+    ) -> tuple[list[str], dict[int, asyncio.Task[str]]]:
+        """Fetch a post's media to disk, starting each upload as soon as its file is saved.
+
+        Local copies and direct CDN downloads need no browser. Only items that fall back
+        to the viewer use `page`, one of self.pages (default: the first), or the page
+        returned by `get_page`, which lets callers start and prepare the browser on first
+        use. Posts fetched on different pages can run concurrently. Returns the per-item
+        paths (original URL where fetching failed) and the in-flight upload tasks keyed
+        by item index; pass both to upload_media_list().
+        """
         dest_dir = self.download_dir / post_id
         dest_dir.mkdir(parents=True, exist_ok=True)
         saved_paths: list[str] = []
+        uploads: dict[int, asyncio.Task[str]] = {}
 
+        # A page's viewer can only show one image at a time, so fetching within a post stays
+        # serial; the uploads run in the background and overlap with the next viewer interaction.
         for index, media_url in enumerate(media_urls, 1):
-            fragment = Path(urlparse(media_url).path).name.split("?")[0]
+            fragment = _image_key(media_url)
             print(f"[Downloader] #{index}/{len(media_urls)} fragment={fragment} -> dest={dest_dir}")
-            saved = await self.process_image_by_url(self.page, fragment, index, dest_dir=dest_dir)
+            # Size variants and reposts of one image share its filename, so anything already
+            # downloaded by an earlier post is reused without touching the network.
+            saved, content = self.local_copy(media_url), None
+            tried: set[str] = set()
+            if saved:
+                print(f"[Downloader] #{index}: already downloaded as {saved}")
+            else:
+                # The CDN URL pattern is fixed, so the original can usually be fetched
+                # directly; the viewer is only needed when that fails.
+                saved, content = await self._fetch_direct(media_url, fragment, dest_dir, tried)
+            if not saved:
+                if tried:
+                    print(f"[Downloader] #{index}: direct download failed, falling back to viewer")
+                viewer_page = page or (await get_page() if get_page else self.page)
+                if not viewer_page:
+                    raise RuntimeError("Browser not started. Call start_browser() and prepare_page() first.")
+                # Loading the page may have revealed a direct URL for this image
+                saved, content = await self._fetch_direct(media_url, fragment, dest_dir, tried)
+            if not saved:
+                saved, content = await self._process_image(viewer_page, fragment, index, dest_dir=dest_dir)
             if saved:
-                uploaded_url = None
                 if self.r2_uploader:
-                    try:
-                        print(f"[Downloader][R2] Uploading saved file {saved}")
-                        uploaded_url = self.r2_uploader.upload_file(saved)
-                        print(f"[Downloader][R2] Uploaded -> {uploaded_url}")
-                    except Exception as e:
-                        print(f"[Downloader][R2] Upload failed for {saved}: {e}")
-                saved_paths.append(uploaded_url or saved)
+                    task = asyncio.create_task(self._upload_deduped(saved, self._upload_sem, content))
+                    self._pending_uploads.add(task)
+                    task.add_done_callback(self._pending_uploads.discard)
+                    uploads[len(saved_paths)] = task
+                saved_paths.append(saved)
             else:
                 # fallback: keep original URL for later retry
                 saved_paths.append(media_url)
 
+        return saved_paths, uploads
+
+    async def _fetch_direct(
+        self, media_url: str, key: str, dest_dir: Path, tried: set[str]
+    ) -> tuple[str | None, bytearray | None]:
+        """Try the direct CDN URLs for an item that are not in `tried` yet (and add them)."""
+        for direct_url in self._direct_urls(media_url, key):
+            if direct_url in tried:
+                continue
+            tried.add(direct_url)
+            fetched = await self.download_image_content(direct_url, key, dest_dir, keep_bytes=True)
+            if fetched:
+                return fetched
+        return None, None
+
+    async def upload_media_list(
+        self, saved_paths: list[str], uploads: dict[int, asyncio.Task[str]]
+    ) -> list[str]:
+        """Wait for the uploads started by fetch_media_list() and return the final URLs/paths."""
+        saved_paths = list(saved_paths)
+        if not uploads:
+            return saved_paths
+
+        # The semaphore inside _upload_deduped is shared by the whole downloader, so
+        # overlapping posts stay within the upload limit.
+        results = await asyncio.gather(*uploads.values(), return_exceptions=True)
+        for i, result in zip(uploads, results):
+            if isinstance(result, BaseException):
+                print(f"[Downloader][R2] Upload failed for {saved_paths[i]}: {result}")
+            else:
+                saved_paths[i] = result
+
         return saved_paths
 
+    async def _upload_deduped(self, saved: str, sem: asyncio.Semaphore, content: bytes | bytearray | None = None) -> str:
+        """Upload a saved file under its content hash, reusing any earlier upload of the same bytes.
+
+        When the file's bytes are passed in, they are hashed and uploaded from memory.
+        """
+        if content is not None:
+            digest = xxhash.xxh3_128(content).hexdigest()
+        else:
+            digest = await asyncio.to_thread(_content_digest, saved)
+        task = self._uploads_by_digest.get(digest)
+        if task is not None:
+            print(f"[Downloader][R2] Same content already uploaded, reusing for {saved}")
+            return await task
+
+        # Content-addressed object name: the same bytes always map to the same key
+        object_name = f"{digest}{Path(saved).suffix.lower()}"
+
+        async def upload() -> str:
+            async with sem:
+                print(f"[Downloader][R2] Uploading saved file {saved} as {object_name}")
+                if content is not None:
+                    uploaded_url = await self.r2_uploader.upload_bytes_async(content, object_name)
+                else:
+                    uploaded_url = await self.r2_uploader.upload_file_async(saved, object_name=object_name)
+                print(f"[Downloader][R2] Uploaded -> {uploaded_url}")
+                return uploaded_url
+
+        task = asyncio.create_task(upload())
+        self._uploads_by_digest[digest] = task
+        try:
+            return await task
+        except BaseException:
+            # Forget failed uploads so a later post can retry the same content
+            self._uploads_by_digest.pop(digest, None)
+            raise
+
     async def run(self, headless: bool = False, scroll_times: int = 5):
         """Main execution method."""
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=headless)
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            page = await context.new_page()
-
-            try:
-                print(f"Navigating to {self.profile_url}")
-                # Use 'domcontentloaded' instead of 'networkidle' as Weibo has continuous network activity
-                await page.goto(self.profile_url, wait_until='domcontentloaded', timeout=60000)
-                # Wait for the main content to load
-                await page.wait_for_selector('.vue-recycle-scroller__item-wrapper', timeout=30000)
-                await asyncio.sleep(3)
-
-                # Initial nudge: scroll a bit to ensure image widgets lazy-load.
-                await page.evaluate("window.scrollTo(0, 400)")
-                await asyncio.sleep(2)
-
-                # Scroll to load more content (if needed)
-                if scroll_times > 0:
-                    await self.scroll_and_load_content(page, scroll_times)
-
-                # Collect thumbnail URLs first to use as stable identifiers
-                print("Collecting image URLs...")
-                thumbnail_urls = await page.evaluate("""
-                    () => {
-                        const wrappers = document.querySelectorAll('.vue-recycle-scroller__item-wrapper');
-                        const urlSet = new Set();
-
-                        wrappers.forEach(wrapper => {
-                            const containers = wrapper.querySelectorAll('.woo-picture-main.woo-picture-hover');
-                            containers.forEach(container => {
-                                const className = container.className || '';
-                                if (className.includes('ProfileHeader_pic')) return;
-
-                                const img = container.querySelector('img');
-                                const src = img?.src;
-                                if (!src) return;
-                                if (!src.includes('sinaimg.cn')) return;
-                                if (src.includes('/emoticon/')) return; // skip emoji assets
-
-                                urlSet.add(src);
-                            });
+        try:
+            await self.start_browser(headless=headless)
+            await self.prepare_page()
+            page = self.page
+
+            # Scroll to load more content (if needed)
+            if scroll_times > 0:
+                await self.scroll_and_load_content(page, scroll_times)
+
+            # Collect thumbnail URLs first to use as stable identifiers
+            print("Collecting image URLs...")
+            thumbnail_urls = await page.evaluate("""
+                () => {
+                    const wrappers = document.querySelectorAll('.vue-recycle-scroller__item-wrapper');
+                    const urlSet = new Set();
+
+                    wrappers.forEach(wrapper => {
+                        const containers = wrapper.querySelectorAll('.woo-picture-main.woo-picture-hover');
+                        containers.forEach(container => {
+                            const className = container.className || '';
+                            if (className.includes('ProfileHeader_pic')) return;
+
+                            const img = container.querySelector('img');
+                            const src = img?.src;
+                            if (!src) return;
+                            if (!src.includes('sinaimg.cn')) return;
+                            if (src.includes('/emoticon/')) return; // skip emoji assets
+
+                            urlSet.add(src);
                         });
+                    });
 
-                        return Array.from(urlSet);
-                    }
-                """)
+                    return Array.from(urlSet);
+                }
+            """)
+
+            # Different size variants of one image are distinct URLs; collapse them by filename
+            seen: set[str] = set()
+            unique_urls = []
+            for url in thumbnail_urls:
+                key = _image_key(url)
+                if key in seen or key in self.downloaded_files:
+                    continue
+                seen.add(key)
+                unique_urls.append(url)
+            thumbnail_urls = unique_urls
 
-                print(f"Found {len(thumbnail_urls)} images to download")
+            print(f"Found {len(thumbnail_urls)} images to download")
 
-                # Process each image by its thumbnail URL
-                for index, thumbnail_url in enumerate(thumbnail_urls, 1):
-                    print(f"\nProcessing image {index}/{len(thumbnail_urls)}")
-                    print(f"Thumbnail URL: {thumbnail_url}")
-                    await self.process_image_by_url(page, thumbnail_url, index, dest_dir=self.download_dir)
+            # Process each image by its thumbnail URL
+            for index, thumbnail_url in enumerate(thumbnail_urls, 1):
+                print(f"\nProcessing image {index}/{len(thumbnail_urls)}")
+                print(f"Thumbnail URL: {thumbnail_url}")
+                await self.process_image_by_url(page, thumbnail_url, index, dest_dir=self.download_dir)
 
-                print(f"\n✓ Download complete! Total images: {len(self.downloaded_urls)}")
-                print(f"Images saved to: {self.download_dir.absolute()}")
+            print(f"\n✓ Download complete! Total images: {len(self.downloaded_files)}")
+            print(f"Images saved to: {self.download_dir.absolute()}")
 
-            except Exception as e:
-                print(f"Error during execution: {e}")
-                import traceback
-                traceback.print_exc()
-            finally:
-                await browser.close()
+        except Exception as e:
+            print(f"Error during execution: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            await self.close_browser()
 
 
 async def main():